@@ -1154,7 +1154,9 @@ def render_live_command(data: Dict[str, Any]):
             }
             
             scenario_id = scenario.get("scenario_id", 1) if not selected_quick else 999
-            assignment = assign_medic(decision_output, triage_output, scenario_seed=scenario_id)
+            assignment = assign_medic(
+                decision_output, triage_output, scenario_seed=scenario_id, include_full_roster=True
+            )
             render_medic_assignment(assignment, category)
             
             st.markdown("<div class='section-spacer'></div>", unsafe_allow_html=True)
@@ -1343,7 +1345,9 @@ def render_triage_tab(data: Dict[str, Any]):
             }
             
             triage_seed = hash(cat) % 1000 + sev
-            assignment = assign_medic(decision_output, triage_output, scenario_seed=triage_seed)
+            assignment = assign_medic(
+                decision_output, triage_output, scenario_seed=triage_seed, include_full_roster=True
+            )
             
             st.markdown("### Assigned Medical Specialist")
             render_medic_assignment(assignment, cat)
@@ -12,6 +12,8 @@ from pathlib import Path
 from typing import List, Dict, Any, Optional, Tuple
 import logging
 
+import numpy as np
+
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -19,6 +21,15 @@ logger = logging.getLogger(__name__)
 # Base directory for data files
 FILES_DIR = Path(__file__).parent.parent / "data"
 
+# Record layout of dispatch_table(): the four dispatch inputs + expected decision
+# (the expected field is a unicode string sized to the longest label in the table)
+DISPATCH_TABLE_DTYPE = [
+    ("weather", "f8"),
+    ("harm", "f8"),
+    ("ground", "f8"),
+    ("air", "f8"),
+]
+
 
 # =============================================================================
 # NORMALIZATION UTILITIES
@@ -470,6 +481,37 @@ def load_cases() -> List[Dict[str, Any]]:
     return normalized
 
 
+def dispatch_table(records: List[Dict[str, Any]]) -> np.recarray:
+    """
+    Pack normalized scenarios or cases into a record array of dispatch inputs.
+    
+    Fields (aligned with records): weather, harm, ground, air (dispatch
+    inputs, float64) and expected (normalized expected decision). Columns
+    can be used directly for vectorized rule evaluation.
+    
+    Args:
+        records: Output of load_scenarios() or load_cases()
+    
+    Returns:
+        np.recarray with DISPATCH_TABLE_DTYPE fields plus expected
+    """
+    # Size the label column so no expected decision is truncated
+    width = max((len(r["expected_decision"]) for r in records), default=0)
+    return np.rec.fromrecords(
+        [
+            (
+                r["weather_risk_pct"],
+                r["harm_threshold_min"],
+                r["ground_eta_min"],
+                r["air_eta_min"],
+                r["expected_decision"],
+            )
+            for r in records
+        ],
+        dtype=DISPATCH_TABLE_DTYPE + [("expected", f"U{max(width, 1)}")],
+    )
+
+
 def load_landing_zones() -> List[Dict[str, Any]]:
     """
     Load and normalize Al_Ghadir_Landing_Zones.json.
@@ -12,8 +12,11 @@ Returns: DOCTOR_DRONE or AMBULANCE
 """
 
 from dataclasses import dataclass
+from functools import lru_cache
 from typing import List, Literal
 
+import numpy as np
+
 # Response mode types (matching D1.md + BOTH for parallel dispatch)
 ResponseMode = Literal["DOCTOR_DRONE", "AMBULANCE", "BOTH"]
 
@@ -73,6 +76,96 @@ WEATHER_RISK_THRESHOLD = 35.0  # Percent - drones unsafe above this
 HARM_THRESHOLD_CRITICAL = True  # Ground ETA must not exceed harm threshold
 EFFICIENCY_TIME_DELTA = 10.0   # Minutes - significant time savings threshold
 
+# Rules in priority order, with the mode and confidence each one yields
+RULE_ORDER: tuple[RuleType, ...] = ("SAFETY_FILTER", "EMERGENCY_OVERRIDE", "EFFICIENCY_OPTIMIZATION", "DEFAULT")
+RULE_MODE: dict[RuleType, ResponseMode] = {
+    "SAFETY_FILTER": "AMBULANCE",
+    "EMERGENCY_OVERRIDE": "BOTH",
+    "EFFICIENCY_OPTIMIZATION": "BOTH",
+    "DEFAULT": "AMBULANCE",
+}
+RULE_CONFIDENCE: dict[RuleType, float] = {
+    "SAFETY_FILTER": 1.0,
+    "EMERGENCY_OVERRIDE": 0.98,
+    "EFFICIENCY_OPTIMIZATION": 0.90,
+    "DEFAULT": 0.9,
+}
+
+
+def rule_flags(
+    weather_risk_pct,
+    harm_threshold_min,
+    ground_eta_min,
+    air_eta_min,
+) -> tuple:
+    """
+    Threshold checks for RULE_ORDER[:-1] (DEFAULT has none), in that order.
+    Plain comparisons, so scalars and numpy arrays both work; dispatch()
+    and rule_indices() share this single definition of the rules.
+    
+    Returns:
+        (exceeds_weather, exceeds_harm, exceeds_efficiency)
+    """
+    return (
+        weather_risk_pct > WEATHER_RISK_THRESHOLD,
+        ground_eta_min > harm_threshold_min,
+        (ground_eta_min - air_eta_min) > EFFICIENCY_TIME_DELTA,
+    )
+
+
+def rule_indices(
+    weather_risk_pct: np.ndarray,
+    harm_threshold_min: np.ndarray,
+    ground_eta_min: np.ndarray,
+    air_eta_min: np.ndarray,
+) -> np.ndarray:
+    """
+    Vectorized dispatch(): index into RULE_ORDER of the rule that fires
+    for each row (first matching flag from rule_flags wins).
+    """
+    flags = rule_flags(
+        np.asarray(weather_risk_pct), np.asarray(harm_threshold_min),
+        np.asarray(ground_eta_min), np.asarray(air_eta_min),
+    )
+    return np.select(flags, range(len(flags)), default=len(RULE_ORDER) - 1)
+
+
+def rule_reasons(
+    rule: RuleType,
+    weather_risk_pct: float,
+    harm_threshold_min: float,
+    ground_eta_min: float,
+    air_eta_min: float,
+    time_delta: float,
+) -> List[str]:
+    """
+    Human-readable reasoning for the rule that made a dispatch decision.
+    Shared by dispatch() and batch callers that evaluate the rules themselves.
+    """
+    if rule == "SAFETY_FILTER":
+        return [
+            f"Weather risk {weather_risk_pct:.1f}% exceeds safety threshold ({WEATHER_RISK_THRESHOLD}%)",
+            "Drone operations unsafe - defaulting to ground ambulance",
+        ]
+    if rule == "EMERGENCY_OVERRIDE":
+        return [
+            f"Ground ETA ({ground_eta_min:.1f} min) exceeds harm threshold ({harm_threshold_min} min)",
+            "CRITICAL: Simultaneous Drone (Speed) + Ambulance (Transport) dispatched",
+            f"Drone arrival: {air_eta_min:.1f} min (saves {time_delta:.1f} min)",
+        ]
+    if rule == "EFFICIENCY_OPTIMIZATION":
+        return [
+            f"Drone saves {time_delta:.1f} min (threshold: {EFFICIENCY_TIME_DELTA} min)",
+            f"Ground ETA: {ground_eta_min:.1f} min vs Drone ETA: {air_eta_min:.1f} min",
+            "Dispatching Drone for immediate aid + Ambulance for transport",
+        ]
+    return [
+        "Ground ambulance is safe and sufficient",
+        f"Weather risk acceptable ({weather_risk_pct:.1f}%)",
+        f"Ground ETA ({ground_eta_min:.1f} min) within harm threshold ({harm_threshold_min} min)",
+        f"Time savings ({time_delta:.1f} min) below efficiency threshold ({EFFICIENCY_TIME_DELTA} min)",
+    ]
+
 
 def dispatch(
     weather_risk_pct: float,
@@ -132,60 +225,14 @@ def dispatch(
         >>> result.rule_triggered
         'EFFICIENCY_OPTIMIZATION'
     """
-    # Calculate time delta
-    time_delta = ground_eta_min - air_eta_min
-    
-    # Check thresholds
-    exceeds_weather = weather_risk_pct > WEATHER_RISK_THRESHOLD
-    exceeds_harm = ground_eta_min > harm_threshold_min
-    exceeds_efficiency = time_delta > EFFICIENCY_TIME_DELTA
-    
-    # Decision variables
-    mode: ResponseMode
-    rule: RuleType
-    reasons: List[str] = []
-    confidence: float
-    
-    # RULE 1: SAFETY_FILTER (highest priority)
-    if exceeds_weather:
-        mode = "AMBULANCE"
-        rule = "SAFETY_FILTER"
-        reasons.append(f"Weather risk {weather_risk_pct:.1f}% exceeds safety threshold ({WEATHER_RISK_THRESHOLD}%)")
-        reasons.append("Drone operations unsafe - defaulting to ground ambulance")
-        confidence = 1.0
-    
-    # RULE 2: EMERGENCY_OVERRIDE (survival priority)
-    elif exceeds_harm:
-        mode = "BOTH"
-        rule = "EMERGENCY_OVERRIDE"
-        reasons.append(f"Ground ETA ({ground_eta_min:.1f} min) exceeds harm threshold ({harm_threshold_min} min)")
-        reasons.append("CRITICAL: Simultaneous Drone (Speed) + Ambulance (Transport) dispatched")
-        reasons.append(f"Drone arrival: {air_eta_min:.1f} min (saves {time_delta:.1f} min)")
-        confidence = 0.98
-    
-    # RULE 3: EFFICIENCY_OPTIMIZATION (significant time savings)
-    elif exceeds_efficiency:
-        mode = "BOTH"
-        rule = "EFFICIENCY_OPTIMIZATION"
-        reasons.append(f"Drone saves {time_delta:.1f} min (threshold: {EFFICIENCY_TIME_DELTA} min)")
-        reasons.append(f"Ground ETA: {ground_eta_min:.1f} min vs Drone ETA: {air_eta_min:.1f} min")
-        reasons.append("Dispatching Drone for immediate aid + Ambulance for transport")
-        confidence = 0.90
-    
-    # RULE 4: DEFAULT (ground ambulance sufficient)
-    else:
-        mode = "AMBULANCE"
-        rule = "DEFAULT"
-        reasons.append("Ground ambulance is safe and sufficient")
-        reasons.append(f"Weather risk acceptable ({weather_risk_pct:.1f}%)")
-        reasons.append(f"Ground ETA ({ground_eta_min:.1f} min) within harm threshold ({harm_threshold_min} min)")
-        reasons.append(f"Time savings ({time_delta:.1f} min) below efficiency threshold ({EFFICIENCY_TIME_DELTA} min)")
-        confidence = 0.9
+    rule, time_delta, exceeds_weather, exceeds_harm, exceeds_efficiency, reasons = _decide(
+        weather_risk_pct, harm_threshold_min, ground_eta_min, air_eta_min
+    )
     
     return DispatchResult(
-        response_mode=mode,
+        response_mode=RULE_MODE[rule],
         rule_triggered=rule,
-        reasons=reasons,
+        reasons=list(reasons),
         weather_risk_pct=weather_risk_pct,
         harm_threshold_min=harm_threshold_min,
         ground_eta_min=ground_eta_min,
@@ -194,10 +241,38 @@ def dispatch(
         exceeds_weather=exceeds_weather,
         exceeds_harm=exceeds_harm,
         exceeds_efficiency=exceeds_efficiency,
-        confidence=confidence,
+        confidence=RULE_CONFIDENCE[rule],
     )
 
 
+# typed=True: 10 and 10.0 format differently in the reasons
+@lru_cache(maxsize=1024, typed=True)
+def _decide(
+    weather_risk_pct: float,
+    harm_threshold_min: float,
+    ground_eta_min: float,
+    air_eta_min: float,
+) -> tuple:
+    """
+    Memoized rule evaluation behind dispatch().
+    
+    Returns:
+        (rule, time_delta, exceeds_weather, exceeds_harm, exceeds_efficiency, reasons tuple)
+    """
+    # Calculate time delta
+    time_delta = ground_eta_min - air_eta_min
+    
+    # Check thresholds
+    flags = rule_flags(weather_risk_pct, harm_threshold_min, ground_eta_min, air_eta_min)
+    exceeds_weather, exceeds_harm, exceeds_efficiency = flags
+    
+    # Rules in priority order: safety, survival, efficiency, default
+    rule = next((r for r, hit in zip(RULE_ORDER, flags) if hit), RULE_ORDER[-1])
+    
+    reasons = rule_reasons(rule, weather_risk_pct, harm_threshold_min, ground_eta_min, air_eta_min, time_delta)
+    return rule, time_delta, exceeds_weather, exceeds_harm, exceeds_efficiency, tuple(reasons)
+
+
 def validate_inputs(
     weather_risk_pct: float,
     harm_threshold_min: float,
@@ -7,8 +7,12 @@ extracting transcription, voice stress, symptoms, and recommended actions.
 
 import os
 import json
+import threading
+from functools import lru_cache
 from typing import Optional
 
+from .triage_engine import SYMPTOM_POINTS
+
 try:
     from google import genai
     from google.genai import types
@@ -28,6 +32,25 @@ def get_api_key():
     return os.environ.get("GEMINI_API_KEY") or os.environ.get("GOOGLE_API_KEY")
 
 
+# Shared client so connection pooling/keep-alive survives across calls
+_CLIENT: Optional["genai.Client"] = None
+_CLIENT_KEY: Optional[str] = None
+_CLIENT_LOCK = threading.Lock()
+
+
+def get_client(api_key: str) -> "genai.Client":
+    """
+    Get or create the process-wide AI client for the given API key.
+    A new client is only built when the key changes.
+    """
+    global _CLIENT, _CLIENT_KEY
+    with _CLIENT_LOCK:
+        if _CLIENT is None or _CLIENT_KEY != api_key:
+            _CLIENT = genai.Client(api_key=api_key)
+            _CLIENT_KEY = api_key
+        return _CLIENT
+
+
 # Symptom mapping from natural language to triage_engine keys
 SYMPTOM_MAPPING = {
     # Cardiac
@@ -94,6 +117,10 @@ SYMPTOM_MAPPING = {
 }
 
 
+# Canonical triage keys for the underscore fallback
+_SYMPTOM_POINT_KEYS = frozenset(SYMPTOM_POINTS)
+
+
 # System instruction for Gemini
 SYSTEM_INSTRUCTION = """
 You are an expert Emergency Medical Dispatcher AI specializing in audio triage analysis.
@@ -222,10 +249,13 @@ Output strictly in JSON format matching the schema provided.
 """
 
 
+@lru_cache(maxsize=1024)
 def map_symptom_to_key(symptom_text: str) -> Optional[str]:
     """
     Map an AI-detected symptom string to a triage_engine SYMPTOM_POINTS key.
-    Uses fuzzy matching for flexibility.
+    Uses fuzzy matching for flexibility; the first SYMPTOM_MAPPING phrase
+    (in mapping order) that matches wins. Memoized, since the model
+    reports the same symptom strings call after call.
     """
     symptom_lower = symptom_text.lower().strip()
     
@@ -240,9 +270,7 @@ def map_symptom_to_key(symptom_text: str) -> Optional[str]:
     
     # Try underscore format (e.g., "chest_pain" -> "chest_pain")
     underscore_version = symptom_lower.replace(" ", "_")
-    # Import here to avoid circular imports
-    from src.triage_engine import SYMPTOM_POINTS
-    if underscore_version in SYMPTOM_POINTS:
+    if underscore_version in _SYMPTOM_POINT_KEYS:
         return underscore_version
     
     return None
@@ -251,14 +279,9 @@ def map_symptom_to_key(symptom_text: str) -> Optional[str]:
 def map_symptoms_to_keys(ai_symptoms: list[str]) -> list[str]:
     """
     Map a list of AI-detected symptom strings to triage_engine keys.
-    Returns only valid, deduplicated keys.
+    Returns only valid, deduplicated keys in first-seen order.
     """
-    keys = set()
-    for symptom in ai_symptoms:
-        key = map_symptom_to_key(symptom)
-        if key:
-            keys.add(key)
-    return list(keys)
+    return list(dict.fromkeys(filter(None, map(map_symptom_to_key, ai_symptoms))))
 
 
 def analyze_audio_call(
@@ -297,7 +320,7 @@ def analyze_audio_call(
         return None
     
     try:
-        client = genai.Client(api_key=api_key)
+        client = get_client(api_key)
         
         # Define the structured output schema
         response_schema = {
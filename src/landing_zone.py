@@ -10,8 +10,9 @@ Coordinates: 24.7745°N, 46.6575°E (from D1.md specification)
 """
 
 import math
-from typing import List, Dict, Optional, Tuple
+from typing import Callable, List, Dict, Optional, Tuple
 from dataclasses import dataclass
+from functools import lru_cache
 import logging
 
 logger = logging.getLogger(__name__)
@@ -109,6 +110,45 @@ def haversine_distance(
     return distance
 
 
+@lru_cache(maxsize=64)
+def make_haversine_from(lat0: float, lon0: float) -> Callable[[float, float], float]:
+    """
+    Build a haversine_distance specialized for a fixed origin point.
+    
+    The origin's radians and cosine are computed once and captured by the
+    returned closure, so each call only pays for the destination terms.
+    Closures are cached per origin, so the default patient location is
+    specialized once per process.
+    
+    Args:
+        lat0, lon0: Origin coordinates in degrees
+    
+    Returns:
+        Function (lat2, lon2) -> distance in kilometers from the origin
+    
+    Examples:
+        >>> from_patient = make_haversine_from(24.7745, 46.6575)
+        >>> round(from_patient(24.7703, 46.6529), 2)
+        0.66
+    """
+    lat0_rad = math.radians(lat0)
+    cos_lat0 = math.cos(lat0_rad)
+    
+    def distance_from_origin(lat2: float, lon2: float) -> float:
+        lat2_rad = math.radians(lat2)
+        dlat = lat2_rad - lat0_rad
+        dlon = math.radians(lon2 - lon0)
+        
+        a = (
+            math.sin(dlat / 2) ** 2 +
+            cos_lat0 * math.cos(lat2_rad) * math.sin(dlon / 2) ** 2
+        )
+        c = 2 * math.atan2(math.sqrt(a), math.sqrt(1 - a))
+        return EARTH_RADIUS_KM * c
+    
+    return distance_from_origin
+
+
 def calculate_bearing(
     lat1: float,
     lon1: float,
@@ -237,6 +277,12 @@ def find_nearest_zone(
     nearest = None
     min_distance = float('inf')
     
+    # The default patient location is shared by most requests
+    if patient_lat == DEFAULT_PATIENT_LAT and patient_lon == DEFAULT_PATIENT_LON:
+        distance_from_patient = make_haversine_from(patient_lat, patient_lon)
+    else:
+        distance_from_patient = None
+    
     for zone in zones:
         zone_lat = zone.get("latitude", 0)
         zone_lon = zone.get("longitude", 0)
@@ -247,7 +293,10 @@ def find_nearest_zone(
             continue
         
         # Calculate distance
-        distance = haversine_distance(patient_lat, patient_lon, zone_lat, zone_lon)
+        if distance_from_patient is not None:
+            distance = distance_from_patient(zone_lat, zone_lon)
+        else:
+            distance = haversine_distance(patient_lat, patient_lon, zone_lat, zone_lon)
         
         if distance < min_distance:
             min_distance = distance
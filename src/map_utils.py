@@ -1,12 +1,76 @@
 import folium
+import numpy as np
+from folium.plugins import FastMarkerCluster
 from streamlit_folium import st_folium
 import streamlit as st
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Tuple
+
+from .medic_matcher import MedicStatus, STATUS_BY_LABEL, STATUS_LABELS
+
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
 
 
 CENTER_LAT = 24.7745
 CENTER_LON = 46.6575
 
+# Leaflet marker factory for FastMarkerCluster rows: [lat, lon, popup, tooltip, color].
+# The two marker icons are built once and shared by every row.
+_MEDIC_MARKER_CALLBACK = """
+(function () {
+    var icons = {
+        green: L.AwesomeMarkers.icon({icon: 'user-md', prefix: 'fa', markerColor: 'green'}),
+        blue: L.AwesomeMarkers.icon({icon: 'user-md', prefix: 'fa', markerColor: 'blue'})
+    };
+    return function (row) {
+        var marker = L.marker(new L.LatLng(row[0], row[1]), {icon: icons[row[4]]});
+        marker.bindPopup(row[2]);
+        marker.bindTooltip(row[3]);
+        return marker;
+    };
+})()
+"""
+
+# Per-medic popup/tooltip markup
+_MEDIC_POPUP = "<b>{name}</b><br>Status: {status}".format
+_MEDIC_TOOLTIP = "{name} ({eta:.1f} min)".format
+
+
+def _compute_etas_numpy(
+    lats: np.ndarray,
+    lons: np.ndarray,
+    p_lat: float,
+    p_lon: float,
+    en_route: np.ndarray,
+) -> np.ndarray:
+    """
+    Fallback ETA (minutes) for each medic from approximate distance
+    (equirectangular, longitude scaled by cos of the mean latitude).
+    En-route medics fly (120 km/h), others drive (40 km/h).
+    """
+    lon_scale = np.cos(np.radians((lats + p_lat) / 2))
+    dist = np.sqrt((lats - p_lat) ** 2 + ((lons - p_lon) * lon_scale) ** 2) * 111
+    speed = np.where(en_route == 1, 120.0, 40.0)
+    return dist / speed * 60
+
+
+if NUMBA_AVAILABLE:
+    @njit(cache=True, fastmath=True)
+    def _compute_etas(lats, lons, p_lat, p_lon, en_route):
+        """Compiled loop version of _compute_etas_numpy."""
+        etas = np.empty(lats.shape[0])
+        for i in range(lats.shape[0]):
+            lon_scale = np.cos(np.radians((lats[i] + p_lat) / 2))
+            dist = ((lats[i] - p_lat) ** 2 + ((lons[i] - p_lon) * lon_scale) ** 2) ** 0.5 * 111
+            speed = 120.0 if en_route[i] == 1 else 40.0
+            etas[i] = dist / speed * 60
+        return etas
+else:
+    _compute_etas = _compute_etas_numpy
+
 
 def _zone_field(zone: Any, key: str, default: Any = None):
     """
@@ -19,28 +83,29 @@ def _zone_field(zone: Any, key: str, default: Any = None):
     return getattr(zone, key, default)
 
 
-def render_mission_map(
-    patient_location: Dict[str, float],
-    landing_zone: Optional[Any] = None,
-    medics: List[Dict[str, Any]] = None,
-    selected_medic: Optional[Dict[str, Any]] = None,
-    height: int = 400
-):
+def _parse_status(label: str):
+    """Map a display status ("En Route") to MedicStatus; unknown labels pass through."""
+    return STATUS_BY_LABEL.get(label, label)
+
+
+@st.cache_resource(max_entries=32)
+def _build_map(
+    p_lat: float,
+    p_lon: float,
+    lz: Optional[Tuple[float, float, str, Optional[float]]],
+    medic_rows: Tuple[Tuple[Any, ...], ...],
+    selected: Optional[Tuple[Any, Optional[Tuple[float, float]]]],
+) -> folium.Map:
     """
-    Render a Mission Map with Folium.
+    Build the Folium mission map from hashable inputs, cached across reruns.
     
     Args:
-        patient_location: {'latitude': float, 'longitude': float}
-        landing_zone: Selected landing zone object/dict
-        medics: List of medic dicts (position, status, etc)
-        selected_medic: Assigned medic dict used to draw direct response route
+        p_lat, p_lon: Patient coordinates
+        lz: (latitude, longitude, name, chain_eta_min) or None
+        medic_rows: (id, name, latitude, longitude, MedicStatus, eta_minutes) per medic
+        selected: (id, gps_location or None) of the assigned medic, or None
     """
-    
-    p_lat = patient_location.get("latitude", 24.7745)
-    p_lon = patient_location.get("longitude", 46.6575)
-    
-    
-    m = folium.Map(location=[p_lat, p_lon], zoom_start=14, tiles="CartoDB dark_matter")
+    m = folium.Map(location=[p_lat, p_lon], zoom_start=14, tiles="CartoDB dark_matter", prefer_canvas=True)
     
     
     folium.Marker(
@@ -58,14 +123,10 @@ def render_mission_map(
         fill_opacity=0.2
     ).add_to(m)
     
+    selected_id, medic_gps = selected if selected else (None, None)
     
-    if landing_zone:
-        lz_lat = _zone_field(landing_zone, "latitude")
-        lz_lon = _zone_field(landing_zone, "longitude")
-        lz_name = _zone_field(landing_zone, "name", "Landing Zone")
-        if lz_lat is None or lz_lon is None:
-            lz_lat = CENTER_LAT
-            lz_lon = CENTER_LON
+    if lz:
+        lz_lat, lz_lon, lz_name, _ = lz
         
         folium.Marker(
             [lz_lat, lz_lon],
@@ -89,69 +150,132 @@ def render_mission_map(
             icon=folium.DivIcon(html=f'<div style="font-size: 10pt; color: #10b981; font-weight: bold;">FLIGHT PATH</div>')
         ).add_to(m)
 
-        if selected_medic:
-            medic_gps = selected_medic.get("gps_location")
-            if isinstance(medic_gps, (list, tuple)) and len(medic_gps) == 2:
-                folium.PolyLine(
-                    locations=[[medic_gps[0], medic_gps[1]], [lz_lat, lz_lon]],
-                    color="#f59e0b",
-                    weight=3,
-                    opacity=0.85,
-                    dash_array="6",
-                ).add_to(m)
-                folium.Marker(
-                    location=[(medic_gps[0] + lz_lat) / 2, (medic_gps[1] + lz_lon) / 2],
-                    icon=folium.DivIcon(
-                        html='<div style="font-size: 9pt; color: #f59e0b; font-weight: bold;">MEDIC TRANSFER</div>'
-                    ),
-                ).add_to(m)
-    elif selected_medic:
-        medic_gps = selected_medic.get("gps_location")
-        if isinstance(medic_gps, (list, tuple)) and len(medic_gps) == 2:
+        if medic_gps:
             folium.PolyLine(
-                locations=[[medic_gps[0], medic_gps[1]], [p_lat, p_lon]],
+                locations=[[medic_gps[0], medic_gps[1]], [lz_lat, lz_lon]],
                 color="#f59e0b",
                 weight=3,
                 opacity=0.85,
                 dash_array="6",
             ).add_to(m)
             folium.Marker(
-                location=[(medic_gps[0] + p_lat) / 2, (medic_gps[1] + p_lon) / 2],
+                location=[(medic_gps[0] + lz_lat) / 2, (medic_gps[1] + lz_lon) / 2],
                 icon=folium.DivIcon(
-                    html='<div style="font-size: 9pt; color: #f59e0b; font-weight: bold;">MEDIC ROUTE</div>'
+                    html='<div style="font-size: 9pt; color: #f59e0b; font-weight: bold;">MEDIC TRANSFER</div>'
                 ),
             ).add_to(m)
+    elif medic_gps:
+        folium.PolyLine(
+            locations=[[medic_gps[0], medic_gps[1]], [p_lat, p_lon]],
+            color="#f59e0b",
+            weight=3,
+            opacity=0.85,
+            dash_array="6",
+        ).add_to(m)
+        folium.Marker(
+            location=[(medic_gps[0] + p_lat) / 2, (medic_gps[1] + p_lon) / 2],
+            icon=folium.DivIcon(
+                html='<div style="font-size: 9pt; color: #f59e0b; font-weight: bold;">MEDIC ROUTE</div>'
+            ),
+        ).add_to(m)
 
     
-    if medics:
-        selected_id = selected_medic.get("id") if selected_medic else None
-        selected_chain_eta = None
-        if landing_zone is not None:
-            selected_chain_eta = _zone_field(landing_zone, "chain_eta_min")
-        for medic in medics:
-            gps = medic.get("gps_location")
-            if not gps: 
-                continue
-                
-            status = medic.get("status", "Available")
-            color = "green" if status == "En Route" else "blue"
+    if medic_rows:
+        selected_chain_eta = lz[3] if lz else None
+        count = len(medic_rows)
+        fallback_etas = _compute_etas(
+            np.fromiter((row[2] for row in medic_rows), dtype=np.float64, count=count),
+            np.fromiter((row[3] for row in medic_rows), dtype=np.float64, count=count),
+            float(p_lat),
+            float(p_lon),
+            np.fromiter((row[4] == MedicStatus.EN_ROUTE for row in medic_rows), dtype=np.int8, count=count),
+        )
+        # Selected medic keeps a regular marker; the rest render in one cluster layer
+        cluster_rows = []
+        for (medic_id, name, lat, lon, status, eta), fallback_eta in zip(medic_rows, fallback_etas):
+            color = "green" if status == MedicStatus.EN_ROUTE else "blue"
+            is_selected = bool(selected_id) and medic_id == selected_id
             
             
-            eta = medic.get("eta_minutes")
-            if selected_id and medic.get("id") == selected_id and selected_chain_eta is not None:
+            if is_selected and selected_chain_eta is not None:
                 eta = float(selected_chain_eta)
             if eta is None or eta == 0:
-                dist = ((gps[0] - p_lat)**2 + (gps[1] - p_lon)**2)**0.5 * 111
-                
-                speed = 120 if status == "En Route" else 40 
-                eta = (dist / speed) * 60
+                eta = float(fallback_eta)
             
-            folium.Marker(
-                gps,
-                popup=f"<b>{medic['name']}</b><br>Status: {status}",
-                tooltip=f"{medic['name']} ({eta:.1f} min)",
-                icon=folium.Icon(color=color, icon="user-md", prefix="fa")
-            ).add_to(m)
+            popup = _MEDIC_POPUP(name=name, status=STATUS_LABELS.get(status, status))
+            tooltip = _MEDIC_TOOLTIP(name=name, eta=eta)
+            if is_selected:
+                folium.Marker(
+                    [lat, lon],
+                    popup=popup,
+                    tooltip=tooltip,
+                    icon=folium.Icon(color=color, icon="user-md", prefix="fa")
+                ).add_to(m)
+            else:
+                cluster_rows.append([lat, lon, popup, tooltip, color])
+        
+        if cluster_rows:
+            FastMarkerCluster(cluster_rows, callback=_MEDIC_MARKER_CALLBACK).add_to(m)
+    
+    return m
+
 
+def render_mission_map(
+    patient_location: Dict[str, float],
+    landing_zone: Optional[Any] = None,
+    medics: List[Dict[str, Any]] = None,
+    selected_medic: Optional[Dict[str, Any]] = None,
+    height: int = 400
+):
+    """
+    Render a Mission Map with Folium.
+    
+    Inputs are reduced to hashable tuples so unchanged reruns reuse the
+    cached map from _build_map instead of rebuilding every marker.
+    
+    Args:
+        patient_location: {'latitude': float, 'longitude': float}
+        landing_zone: Selected landing zone object/dict
+        medics: List of medic dicts (position, status, etc)
+        selected_medic: Assigned medic dict used to draw direct response route
+    """
+    
+    p_lat = patient_location.get("latitude", 24.7745)
+    p_lon = patient_location.get("longitude", 46.6575)
+    
+    lz = None
+    if landing_zone:
+        lz_lat = _zone_field(landing_zone, "latitude")
+        lz_lon = _zone_field(landing_zone, "longitude")
+        if lz_lat is None or lz_lon is None:
+            lz_lat = CENTER_LAT
+            lz_lon = CENTER_LON
+        lz = (
+            lz_lat,
+            lz_lon,
+            _zone_field(landing_zone, "name", "Landing Zone"),
+            _zone_field(landing_zone, "chain_eta_min"),
+        )
+    
+    medic_rows = tuple(
+        (
+            medic.get("id"),
+            medic["name"],
+            medic["gps_location"][0],
+            medic["gps_location"][1],
+            _parse_status(medic.get("status", "Available")),
+            medic.get("eta_minutes"),
+        )
+        for medic in medics or []
+        if medic.get("gps_location")
+    )
+    
+    selected = None
+    if selected_medic:
+        medic_gps = selected_medic.get("gps_location")
+        if not (isinstance(medic_gps, (list, tuple)) and len(medic_gps) == 2):
+            medic_gps = None
+        selected = (selected_medic.get("id"), tuple(medic_gps) if medic_gps else None)
     
+    m = _build_map(p_lat, p_lon, lz, medic_rows, selected)
     st_folium(m, width="100%", height=height)
@@ -3,26 +3,153 @@ SAHM Step 4: Medic Matching System
 Ultra-fast medic assignment (<3 seconds) based on location, specialty, and availability.
 """
 
+from collections import defaultdict
+import math
 import random
 import time
 from typing import Dict, List, Optional
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from datetime import datetime, timedelta
+from enum import IntEnum
+from functools import lru_cache
 
+import numpy as np
 
-@dataclass
+from .landing_zone import EARTH_RADIUS_KM, haversine_distance
+
+try:
+    from scipy.spatial import cKDTree
+    SCIPY_AVAILABLE = True
+except ImportError:
+    SCIPY_AVAILABLE = False
+
+try:
+    import h3
+    H3_AVAILABLE = True
+except ImportError:
+    H3_AVAILABLE = False
+
+# Rosters larger than this are narrowed to the nearest medics before scoring
+# (H3 ring or kd-tree); the 15-medic demo roster is always scored in full,
+# where a prefilter would be pure overhead
+KDTREE_MIN_ROSTER = 100
+NEAREST_CANDIDATES = 10
+
+# H3 prefilter: resolution-8 cells (~0.5 km edge), k-ring 2 around the patient (~2 km)
+H3_RESOLUTION = 8
+H3_RING = 2
+
+# Slack on prefilter search radii for H3 cell distortion and the kd-tree's planar projection
+PREFILTER_RADIUS_MARGIN = 1.05
+KM_PER_DEGREE = EARTH_RADIUS_KM * math.pi / 180
+
+# Certification level -> normalized score
+CERT_SCORES = {"paramedic": 0.7, "emt_advanced": 0.85, "critical_care": 1.0}
+
+
+class MedicStatus(IntEnum):
+    """Medic availability (int-valued so comparisons are a single integer compare)"""
+    AVAILABLE = 0
+    ON_MISSION = 1
+    OFF_DUTY = 2
+    EN_ROUTE = 3
+    
+    @property
+    def label(self) -> str:
+        """Display string, e.g. 'On Mission'"""
+        return STATUS_LABELS[self]
+
+
+STATUS_LABELS = {status: status.name.replace('_', ' ').title() for status in MedicStatus}
+STATUS_BY_LABEL = {label: status for status, label in STATUS_LABELS.items()}
+
+
+@dataclass(slots=True)
 class Medic:
-    """Represents a human medic in the SAHM system"""
+    """
+    Represents a human medic in the SAHM system.
+    The score components are computed from current_load, rating and
+    certification_level at construction, and MedicDatabase copies
+    static_score into its arrays; to change those fields, build a new
+    Medic (dataclasses.replace) and a new MedicDatabase.
+    """
     id: str
     name: str
     specialty: str  # cardiac, trauma, respiratory, general, pediatric
     certification_level: str  # paramedic, emt_advanced, critical_care
     gps_location: tuple[float, float]  # (latitude, longitude)
-    status: str  # available, on_mission, off_duty
+    status: MedicStatus
     current_load: int  # 0-100, workload percentage
     missions_completed: int
     rating: float  # 0.0 - 5.0
     languages: List[str]  # ["ar", "en", "ur"]
+    
+    # Match score components that don't depend on the case (set in __post_init__)
+    workload_score: float = field(init=False, repr=False, compare=False)
+    rating_score: float = field(init=False, repr=False, compare=False)
+    cert_score: float = field(init=False, repr=False, compare=False)
+    static_score: float = field(init=False, repr=False, compare=False)
+    
+    def __post_init__(self):
+        self.workload_score = 1 - (self.current_load / 100)
+        self.rating_score = self.rating / 5.0
+        self.cert_score = CERT_SCORES[self.certification_level]
+        # Workload (15%) + rating (10%) + certification (5%) share of the composite
+        self.static_score = (
+            self.workload_score * 0.15 +
+            self.rating_score * 0.10 +
+            self.cert_score * 0.05
+        )
+
+
+def _top_k(scores: np.ndarray, k: int) -> np.ndarray:
+    """
+    Positions of the k highest scores, highest first, ties in original order.
+    Same result as a stable full sort, but O(N) via argpartition.
+    """
+    if scores.size <= k:
+        return np.argsort(-scores, kind="stable")
+    
+    kth_score = scores[np.argpartition(-scores, k - 1)[k - 1]]
+    pool = np.flatnonzero(scores >= kth_score)  # top k plus any boundary ties
+    return pool[np.argsort(-scores[pool], kind="stable")[:k]]
+
+
+def _round_scores(scores: np.ndarray) -> np.ndarray:
+    """
+    scores rounded to 3 decimals exactly as round(score, 3) does; np.round
+    only disagrees within float error of a half step, so those few go
+    through round().
+    """
+    rounded = np.round(scores, 3)
+    scaled = scores * 1000
+    for i in np.flatnonzero(np.abs(scaled - np.floor(scaled) - 0.5) < 1e-6).tolist():
+        rounded[i] = round(float(scores[i]), 3)
+    return rounded
+
+
+def _build_specialty_compat(
+    specialty_map: Dict[str, List[str]],
+) -> tuple[Dict[str, int], np.ndarray]:
+    """
+    Precompute specialty match scores for every (specialty, category) pair.
+    1.0 = listed for the specialty, 0.7 = general medic, 0.4 = otherwise.
+    
+    Returns:
+        (category -> column id, matrix indexed [specialty_id, category_id]);
+        the extra last column covers categories no specialty lists
+    """
+    categories = dict.fromkeys(cat for cats in specialty_map.values() for cat in cats)
+    category_ids = {cat: i for i, cat in enumerate(categories)}
+    
+    compat = np.full((len(specialty_map), len(category_ids) + 1), 0.4)
+    for specialty_id, (specialty, cats) in enumerate(specialty_map.items()):
+        if specialty == "general":
+            compat[specialty_id, :] = 0.7
+        for cat in cats:
+            compat[specialty_id, category_ids[cat]] = 1.0
+    compat.flags.writeable = False
+    return category_ids, compat
 
 
 class MedicDatabase:
@@ -41,13 +168,42 @@ class MedicDatabase:
         "general": ["infection_fever", "gi_dehydration", "allergic", "other_unclear", "mental_health"],
     }
     
-    def __init__(self, seed: int = 42):
-        """Initialize with fixed seed for deterministic medic generation"""
-        self._rng = random.Random(seed)
-        self.medics = self._generate_mock_medics()
+    # Specialty -> row id used by specialty_id_arr
+    SPECIALTY_IDS = {specialty: i for i, specialty in enumerate(SPECIALTY_MAP)}
+    
+    # Category -> column id, and the [specialty_id, category_id] match table
+    CATEGORY_IDS, SPECIALTY_COMPAT = _build_specialty_compat(SPECIALTY_MAP)
+    
+    # Longitude scale for the kd-tree's local planar projection
+    KDTREE_LON_SCALE = float(np.cos(np.radians(RIYADH_CENTER[0])))
+    
+    def __init__(self, seed: int = 42, medics: Optional[List[Medic]] = None):
+        """
+        Initialize with fixed seed for deterministic medic generation.
+        
+        Args:
+            seed: Seed for the generated demo roster
+            medics: Use this roster instead of generating one (see from_medics)
+        """
+        self._rng = np.random.default_rng(seed)
+        self.medics = list(medics) if medics is not None else self._generate_mock_medics()
+        self._build_arrays()
+        self._by_id = {m.id: m for m in self.medics}
+        self._available_cache: Optional[List[Medic]] = None
+        self._kdtree = None
+        self._cell_buckets = None
+        self._max_affinity: Dict[int, float] = {}
+        # Medic positions are static, and patient locations repeat per scenario seed.
+        # Call self.distances_km.cache_clear() if positions ever change.
+        self.distances_km = lru_cache(maxsize=512)(self._distances_km)
+    
+    @classmethod
+    def from_medics(cls, medics: List[Medic]) -> "MedicDatabase":
+        """Database over a caller-supplied roster (e.g. large synthetic rosters)."""
+        return cls(medics=medics)
     
     def _generate_mock_medics(self) -> List[Medic]:
-        """Generate realistic mock medic profiles (deterministic with seed)"""""
+        """Generate realistic mock medic profiles (deterministic with seed)"""
         
         names = [
             "Dr. Ahmed Al-Rashid", "Dr. Fatima Al-Zahrani", "Mohammed Al-Qahtani",
@@ -59,48 +215,147 @@ class MedicDatabase:
         
         specialties = ["cardiac", "trauma", "respiratory", "neuro", "pediatric", "general"]
         certifications = ["paramedic", "emt_advanced", "critical_care"]
+        languages = ["ar", "en", "ur", "fr"]
+        
+        # Most medics available, some on mission
+        status_pool = ["available"] * 7 + ["on_mission"] * 2 + ["off_duty"] * 1
+        
+        # One vectorized draw per column (deterministic with seed)
+        n = len(names)
+        rng = self._rng
+        lats = (self.RIYADH_CENTER[0] + rng.uniform(-0.18, 0.18, n)).round(6).tolist()  # ~20km of center
+        lons = (self.RIYADH_CENTER[1] + rng.uniform(-0.18, 0.18, n)).round(6).tolist()
+        statuses = [MedicStatus[s.upper()] for s in rng.choice(status_pool, size=n).tolist()]
+        loads = rng.integers(0, 80, n, endpoint=True).tolist()
+        missions = rng.integers(15, 250, n, endpoint=True).tolist()
+        ratings = rng.uniform(4.2, 5.0, n).round(1).tolist()
+        language_counts = rng.integers(2, 3, n, endpoint=True).tolist()
+        language_orders = rng.permuted(np.tile(languages, (n, 1)), axis=1).tolist()
         
         medics = []
         for i, name in enumerate(names):
-            # Deterministic GPS within ~20km of Riyadh center
-            lat = self.RIYADH_CENTER[0] + self._rng.uniform(-0.18, 0.18)
-            lon = self.RIYADH_CENTER[1] + self._rng.uniform(-0.18, 0.18)
-            
-            # Most medics available, some on mission
-            status_pool = ["available"] * 7 + ["on_mission"] * 2 + ["off_duty"] * 1
-            
             medic = Medic(
                 id=f"MED-{1000 + i}",
                 name=name,
                 specialty=specialties[i % len(specialties)],  # Deterministic specialty
                 certification_level=certifications[i % len(certifications)],  # Deterministic cert
-                gps_location=(round(lat, 6), round(lon, 6)),
-                status=self._rng.choice(status_pool),
-                current_load=self._rng.randint(0, 80),
-                missions_completed=self._rng.randint(15, 250),
-                rating=round(self._rng.uniform(4.2, 5.0), 1),
-                languages=self._rng.sample(["ar", "en", "ur", "fr"], k=self._rng.randint(2, 3)),
+                gps_location=(lats[i], lons[i]),
+                status=statuses[i],
+                current_load=loads[i],
+                missions_completed=missions[i],
+                rating=ratings[i],
+                languages=language_orders[i][:language_counts[i]],
             )
             medics.append(medic)
         
         return medics
     
+    def _build_arrays(self):
+        """
+        Build Struct-of-Arrays columns over self.medics (same order) so the
+        matcher can score the whole roster with NumPy expressions.
+        """
+        medics = self.medics
+        self.lat_arr = np.array([m.gps_location[0] for m in medics], dtype=np.float64)
+        self.lon_arr = np.array([m.gps_location[1] for m in medics], dtype=np.float64)
+        self.lats_rad = np.deg2rad(self.lat_arr)
+        self.lons_rad = np.deg2rad(self.lon_arr)
+        self.cos_lat_arr = np.cos(self.lats_rad)
+        self.static_score_arr = np.array([m.static_score for m in medics], dtype=np.float64)
+        self.specialty_id_arr = np.array([self.SPECIALTY_IDS[m.specialty] for m in medics], dtype=np.int8)
+        self.avail_mask = np.array([m.status == MedicStatus.AVAILABLE for m in medics], dtype=bool)
+    
+    def haversine_km(self, patient_location: tuple[float, float], idx: Optional[np.ndarray] = None) -> np.ndarray:
+        """
+        Great-circle distance in km from the medics at roster indices idx
+        (all medics if None) to the patient, using the precomputed radian columns.
+        """
+        lats_rad, lons_rad, cos_lat = self.lats_rad, self.lons_rad, self.cos_lat_arr
+        if idx is not None:
+            lats_rad, lons_rad, cos_lat = lats_rad[idx], lons_rad[idx], cos_lat[idx]
+        
+        p_lat_rad = np.radians(patient_location[0])
+        p_lon_rad = np.radians(patient_location[1])
+        a = (
+            np.sin((lats_rad - p_lat_rad) / 2) ** 2
+            + np.cos(p_lat_rad) * cos_lat * np.sin((lons_rad - p_lon_rad) / 2) ** 2
+        )
+        return 2 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(a))
+    
+    def _distances_km(self, patient_location: tuple[float, float]) -> np.ndarray:
+        """
+        Distance in km from every medic to the patient.
+        Backs the cached distances_km; the array is read-only.
+        """
+        distance = self.haversine_km(patient_location)
+        distance.flags.writeable = False
+        return distance
+    
+    def category_column(self, case_category: str) -> int:
+        """SPECIALTY_COMPAT column for a case category (unknown -> last column)"""
+        return self.CATEGORY_IDS.get(case_category, len(self.CATEGORY_IDS))
+    
+    def get_kdtree(self):
+        """
+        kd-tree over available medic positions, built lazily and rebuilt
+        after a status change. Points are (lat, lon * cos(center lat)) in
+        degrees so nearest-neighbour order follows ground distance.
+        Returns (tree, roster indices of tree points).
+        """
+        if self._kdtree is None:
+            idx = np.flatnonzero(self.avail_mask)
+            points = np.c_[self.lat_arr[idx], self.lon_arr[idx] * self.KDTREE_LON_SCALE]
+            self._kdtree = (cKDTree(points), idx)
+        return self._kdtree
+    
+    def get_cell_buckets(self) -> Dict[str, np.ndarray]:
+        """
+        Available medic roster indices bucketed by H3 cell, built lazily and
+        rebuilt after a status change. Requires h3.
+        """
+        if self._cell_buckets is None:
+            buckets = defaultdict(list)
+            for i in np.flatnonzero(self.avail_mask).tolist():
+                buckets[h3.latlng_to_cell(self.lat_arr[i], self.lon_arr[i], H3_RESOLUTION)].append(i)
+            self._cell_buckets = {cell: np.array(idx, dtype=np.intp) for cell, idx in buckets.items()}
+        return self._cell_buckets
+    
+    def max_affinity(self, case_category: str) -> float:
+        """
+        Best distance-independent part of the match score (specialty +
+        static) among available medics for a case category, cached per
+        category until a status changes.
+        """
+        column = self.category_column(case_category)
+        best = self._max_affinity.get(column)
+        if best is None:
+            idx = np.flatnonzero(self.avail_mask)
+            affinity = self.SPECIALTY_COMPAT[self.specialty_id_arr[idx], column] * 0.30 + self.static_score_arr[idx]
+            best = self._max_affinity[column] = float(affinity.max(initial=0.0))
+        return best
+    
     def get_available_medics(self) -> List[Medic]:
-        """Return only medics with 'available' status"""
-        return [m for m in self.medics if m.status == "available"]
+        """Return only medics with 'available' status (cached until a status changes)"""
+        if self._available_cache is None:
+            self._available_cache = [m for m in self.medics if m.status == MedicStatus.AVAILABLE]
+        return self._available_cache
     
     def get_by_id(self, medic_id: str) -> Optional[Medic]:
         """Retrieve specific medic by ID"""
-        for medic in self.medics:
-            if medic.id == medic_id:
-                return medic
-        return None
+        return self._by_id.get(medic_id)
     
-    def update_status(self, medic_id: str, new_status: str):
-        """Update medic availability status"""
+    def update_status(self, medic_id: str, new_status: MedicStatus | str):
+        """Update medic availability status (enum member or name such as "on_mission")"""
         medic = self.get_by_id(medic_id)
         if medic:
+            if isinstance(new_status, str):
+                new_status = MedicStatus[new_status.upper()]
             medic.status = new_status
+            self._available_cache = None
+            self._kdtree = None
+            self._cell_buckets = None
+            self._max_affinity = {}
+            self.avail_mask = np.array([m.status == MedicStatus.AVAILABLE for m in self.medics], dtype=bool)
 
 
 class MedicMatcher:
@@ -109,8 +364,8 @@ class MedicMatcher:
     Finds optimal medic in <3 seconds based on multiple factors.
     """
     
-    def __init__(self):
-        self.db = MedicDatabase()
+    def __init__(self, db: Optional[MedicDatabase] = None):
+        self.db = db if db is not None else MedicDatabase()
     
     def _calculate_distance(
         self,
@@ -118,19 +373,10 @@ class MedicMatcher:
         loc2: tuple[float, float]
     ) -> float:
         """
-        Calculate approximate distance in kilometers.
-        Uses simplified Haversine formula.
+        Calculate great-circle distance in kilometers (unrounded).
+        Scalar counterpart of MedicDatabase.haversine_km.
         """
-        lat1, lon1 = loc1
-        lat2, lon2 = loc2
-        
-        # Simplified distance (good enough for mock)
-        lat_diff = abs(lat2 - lat1)
-        lon_diff = abs(lon2 - lon1)
-        
-        # Rough conversion: 1 degree ≈ 111 km
-        distance_km = ((lat_diff ** 2 + lon_diff ** 2) ** 0.5) * 111
-        return round(distance_km, 2)
+        return haversine_distance(loc1[0], loc1[1], loc2[0], loc2[1])
     
     def _estimate_eta(self, distance_km: float, mode: str) -> float:
         """
@@ -160,19 +406,13 @@ class MedicMatcher:
     ) -> float:
         """
         Score specialty match (0.0 to 1.0).
-        1.0 = perfect match, 0.5 = general can handle, 0.0 = mismatch
+        1.0 = perfect match, 0.7 = general can handle, 0.4 = partial match
+        (e.g., cardiac for respiratory). Read from SPECIALTY_COMPAT.
         """
-        # Perfect match
-        if medic_specialty in self.db.SPECIALTY_MAP:
-            if case_category in self.db.SPECIALTY_MAP[medic_specialty]:
-                return 1.0
-        
-        # General medics can handle anything at reduced score
-        if medic_specialty == "general":
-            return 0.7
-        
-        # Partial match (e.g., cardiac for respiratory)
-        return 0.4
+        specialty_id = self.db.SPECIALTY_IDS.get(medic_specialty)
+        if specialty_id is None:
+            return 0.4
+        return float(self.db.SPECIALTY_COMPAT[specialty_id, self.db.category_column(case_category)])
     
     def _calculate_match_score(
         self,
@@ -181,10 +421,14 @@ class MedicMatcher:
         patient_location: tuple[float, float],
         severity: int,
         mode: str,
+        distance: Optional[float] = None,
     ) -> Dict:
         """
         Calculate composite match score.
         
+        distance (km) may be passed in when already computed by the
+        vectorized ranking, so both paths score the same value.
+        
         Factors:
         - Distance (40% weight)
         - Specialty match (30% weight)
@@ -192,46 +436,162 @@ class MedicMatcher:
         - Rating (10% weight)
         - Certification (5% weight)
         """
-        distance = self._calculate_distance(medic.gps_location, patient_location)
+        if distance is None:
+            distance = self._calculate_distance(medic.gps_location, patient_location)
         eta = self._estimate_eta(distance, mode)
         specialty_score = self._calculate_specialty_match(medic.specialty, case_category)
         
         # Normalize scores to 0-1
         distance_score = max(0, 1 - (distance / 20))  # 20km max range
-        workload_score = 1 - (medic.current_load / 100)
-        rating_score = medic.rating / 5.0
-        cert_score = {"paramedic": 0.7, "emt_advanced": 0.85, "critical_care": 1.0}[medic.certification_level]
         
-        # Weighted composite score
+        # Weighted composite score (workload/rating/cert part is precomputed)
         composite_score = (
             distance_score * 0.40 +
             specialty_score * 0.30 +
-            workload_score * 0.15 +
-            rating_score * 0.10 +
-            cert_score * 0.05
+            medic.static_score
         )
         
         return {
             "medic_id": medic.id,
             "composite_score": round(composite_score, 3),
-            "distance_km": distance,
+            "distance_km": round(distance, 2),
             "eta_minutes": eta,
             "specialty_match": specialty_score,
             "breakdown": {
                 "distance_score": round(distance_score, 2),
                 "specialty_score": round(specialty_score, 2),
-                "workload_score": round(workload_score, 2),
-                "rating_score": round(rating_score, 2),
-                "cert_score": round(cert_score, 2),
+                "workload_score": round(medic.workload_score, 2),
+                "rating_score": round(medic.rating_score, 2),
+                "cert_score": round(medic.cert_score, 2),
             }
         }
     
+    def _score_all(
+        self,
+        patient_location: tuple[float, float],
+        mode: str,
+        case_category: str,
+        idx: np.ndarray,
+        distance: Optional[np.ndarray] = None,
+    ) -> np.ndarray:
+        """
+        Vectorized composite score for the medics at roster indices idx.
+        Same weights as _calculate_match_score, unrounded; find_best_match
+        ranks on _round_scores of these, so ties on the reported (rounded)
+        composite_score keep roster order as in a full sort.
+        
+        Args:
+            distance: Distances (km) aligned with idx, or None to use the
+                cached roster distance vector
+        
+        Returns:
+            Array of composite scores aligned with idx
+        """
+        db = self.db
+        if distance is None:
+            distance = db.distances_km(tuple(patient_location))[idx]
+        
+        specialty_score = db.SPECIALTY_COMPAT[db.specialty_id_arr[idx], db.category_column(case_category)]
+        
+        distance_score = np.maximum(0, 1 - (distance / 20))  # 20km max range
+        
+        composite_score = (
+            distance_score * 0.40 +
+            specialty_score * 0.30 +
+            db.static_score_arr[idx]
+        )
+        return composite_score
+    
+    def _score_radius_km(
+        self,
+        patient_location: tuple[float, float],
+        mode: str,
+        case_category: str,
+        idx: np.ndarray,
+        distance: np.ndarray,
+    ) -> float:
+        """
+        Distance (km) beyond which no medic can reach the 4th-best rounded
+        score among idx: a medic d km away scores at most
+        0.40 * (1 - d / 20) + db.max_affinity(case_category).
+        """
+        composite = _round_scores(self._score_all(patient_location, mode, case_category, idx, distance))
+        # Anything within half a rounding step below still rounds onto the 4th-best score
+        fourth = np.sort(composite)[-min(4, composite.size)] - 0.0005
+        return 20 * (1 - (fourth - self.db.max_affinity(case_category)) / 0.40)
+    
+    def _nearest_candidates(
+        self,
+        patient_location: tuple[float, float],
+        available_idx: np.ndarray,
+        mode: str,
+        case_category: str,
+    ) -> tuple[np.ndarray, Optional[np.ndarray]]:
+        """
+        Narrow large rosters to nearby available medics: the H3 k-ring around
+        the patient if it holds enough medics, else the kd-tree's nearest.
+        Small rosters (or neither h3 nor scipy) are scored in full.
+        
+        The nearest medics alone are an approximation: distance is only 40%
+        of the score, so a better specialty match further out can outrank
+        all of them. The pool is therefore widened to every medic within
+        _score_radius_km of the patient, which keeps the top 4 equal to a
+        full scan up to PREFILTER_RADIUS_MARGIN.
+        
+        Returns:
+            (roster indices to score, their distances in km or None)
+        """
+        if available_idx.size <= KDTREE_MIN_ROSTER:
+            return available_idx, None
+        
+        if H3_AVAILABLE:
+            buckets = self.db.get_cell_buckets()
+            patient_cell = h3.latlng_to_cell(patient_location[0], patient_location[1], H3_RESOLUTION)
+            in_ring = [buckets[cell] for cell in h3.grid_disk(patient_cell, H3_RING) if cell in buckets]
+            if sum(idx.size for idx in in_ring) >= NEAREST_CANDIDATES:
+                candidate_idx = np.concatenate(in_ring)
+                radius = PREFILTER_RADIUS_MARGIN * self._score_radius_km(
+                    patient_location, mode, case_category,
+                    candidate_idx, self.db.haversine_km(patient_location, candidate_idx),
+                )
+                # Medics outside the k-ring are at least (1.5k - 0.5) cell edges away
+                boundary = h3.cell_to_boundary(patient_cell)
+                edge_km = min(
+                    haversine_distance(*boundary[i - 1], *boundary[i]) for i in range(len(boundary))
+                )
+                ring = math.ceil((radius / edge_km + 0.5) / 1.5)
+                if ring > H3_RING:
+                    if 3 * ring * (ring + 1) + 1 >= len(buckets):
+                        return available_idx, None
+                    candidate_idx = np.concatenate(
+                        [buckets[cell] for cell in h3.grid_disk(patient_cell, ring) if cell in buckets]
+                    )
+                candidate_idx = np.sort(candidate_idx)
+                return candidate_idx, self.db.haversine_km(patient_location, candidate_idx)
+        
+        if not SCIPY_AVAILABLE:
+            return available_idx, None
+        
+        tree, tree_idx = self.db.get_kdtree()
+        query = (patient_location[0], patient_location[1] * self.db.KDTREE_LON_SCALE)
+        _, pos = tree.query(query, k=min(NEAREST_CANDIDATES, tree_idx.size))
+        candidate_idx = tree_idx[pos]
+        radius = PREFILTER_RADIUS_MARGIN * self._score_radius_km(
+            patient_location, mode, case_category,
+            candidate_idx, self.db.haversine_km(patient_location, candidate_idx),
+        )
+        if radius > 0:
+            in_radius = tree.query_ball_point(query, radius / KM_PER_DEGREE)
+            candidate_idx = np.union1d(candidate_idx, tree_idx[in_radius])
+        return candidate_idx, self.db.haversine_km(patient_location, candidate_idx)
+    
     def find_best_match(
         self,
         decision_output: Dict,
         triage_output: Dict,
         patient_location: tuple[float, float] = None,
         scenario_seed: int = None,
+        include_full_roster: bool = False,
     ) -> Dict:
         """
         Main matching function.
@@ -242,6 +602,8 @@ class MedicMatcher:
             triage_output: Result from Step 2 (AI Triage)
             patient_location: (lat, lon) or None for derived location
             scenario_seed: Optional seed for deterministic patient location
+            include_full_roster: Also return "all_medics" (every medic's
+                position and status, e.g. for map layers)
         
         Returns:
             Dict with assigned medic details and match reasoning
@@ -272,9 +634,9 @@ class MedicMatcher:
             }
         
         # Get available medics
-        available = self.db.get_available_medics()
+        available_idx = np.flatnonzero(self.db.avail_mask)
         
-        if not available:
+        if available_idx.size == 0:
             return {
                 "assigned_medic": None,
                 "reasoning": "No medics currently available",
@@ -284,19 +646,23 @@ class MedicMatcher:
         
         # Calculate match scores
         mode = "aerial" if response_mode in ["aerial_only", "combined"] else "ground"
-        scores = []
-        
-        for medic in available:
-            score_data = self._calculate_match_score(
-                medic, category, patient_location, severity, mode
-            )
-            scores.append({
-                "medic": medic,
-                "score_data": score_data,
-            })
+        candidate_idx, candidate_dist = self._nearest_candidates(patient_location, available_idx, mode, category)
+        if candidate_dist is None:
+            candidate_dist = self.db.distances_km(tuple(patient_location))[candidate_idx]
+        composite = self._score_all(patient_location, mode, category, candidate_idx, candidate_dist)
         
-        # Sort by composite score (highest first)
-        scores.sort(key=lambda x: x["score_data"]["composite_score"], reverse=True)
+        # Rank candidates by rounded composite score (highest first, stable on ties)
+        # and only build score dicts for the best match + 3 alternates
+        top = _top_k(_round_scores(composite), 4)
+        scores = [
+            {
+                "medic": self.db.medics[i],
+                "score_data": self._calculate_match_score(
+                    self.db.medics[i], category, patient_location, severity, mode, float(distance)
+                ),
+            }
+            for i, distance in zip(candidate_idx[top], candidate_dist[top])
+        ]
         
         # Select best match
         best = scores[0]
@@ -309,7 +675,7 @@ class MedicMatcher:
         # Build result
         match_time = round(time.time() - start_time, 3)
         
-        return {
+        result = {
             "assigned_medic": {
                 "id": best_medic.id,
                 "name": best_medic.name,
@@ -320,7 +686,7 @@ class MedicMatcher:
                 "distance_km": best_score["distance_km"],
                 "eta_minutes": best_score["eta_minutes"],
                 "missions_completed": best_medic.missions_completed,
-                "status": "En Route",  # Assigned medic is now en route
+                "status": MedicStatus.EN_ROUTE.label,  # Assigned medic is now en route
                 "gps_location": best_medic.gps_location,
             },
             "match_score": best_score["composite_score"],
@@ -338,21 +704,11 @@ class MedicMatcher:
                     "score": alt["score_data"]["composite_score"],
                     "eta_minutes": alt["score_data"]["eta_minutes"],
                     "specialty": alt["medic"].specialty,
-                    "status": alt["medic"].status.replace('_', ' ').title(),
+                    "status": alt["medic"].status.label,
                     "gps_location": alt["medic"].gps_location,
                 }
                 for alt in scores[1:4]  # Top 3 alternatives
             ] if len(scores) > 1 else [],
-            "all_medics": [
-                {
-                    "id": m.id,
-                    "name": m.name,
-                    "specialty": m.specialty,
-                    "status": m.status.replace('_', ' ').title() if m.id != best_medic.id else "En Route",
-                    "gps_location": m.gps_location,
-                }
-                for m in self.db.medics
-            ],
             "match_time_seconds": match_time,
             "patient_location": {
                 "latitude": round(patient_location[0], 6),
@@ -360,6 +716,20 @@ class MedicMatcher:
             },
             "status": "success",
         }
+        
+        if include_full_roster:
+            result["all_medics"] = [
+                {
+                    "id": m.id,
+                    "name": m.name,
+                    "specialty": m.specialty,
+                    "status": m.status.label if m.id != best_medic.id else MedicStatus.EN_ROUTE.label,
+                    "gps_location": m.gps_location,
+                }
+                for m in self.db.medics
+            ]
+        
+        return result
 
 # Singleton instance for session consistency
 _matcher_instance: Optional[MedicMatcher] = None
@@ -378,6 +748,7 @@ def assign_medic(
     triage_output: Dict,
     patient_location: tuple[float, float] = None,
     scenario_seed: int = None,
+    include_full_roster: bool = False,
 ) -> Dict:
     """
     Wrapper function for easy integration.
@@ -388,10 +759,13 @@ def assign_medic(
         triage_output: Result from AI Triage
         patient_location: Optional explicit (lat, lon)
         scenario_seed: Optional seed for deterministic patient location
+        include_full_roster: Also return "all_medics" for map layers
     
     Usage:
         from medic_matcher import assign_medic
         assignment = assign_medic(decision_result, triage_result, scenario_seed=scenario_id)
     """
     matcher = get_matcher()
-    return matcher.find_best_match(decision_output, triage_output, patient_location, scenario_seed)
+    return matcher.find_best_match(
+        decision_output, triage_output, patient_location, scenario_seed, include_full_roster
+    )
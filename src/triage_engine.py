@@ -3,10 +3,21 @@ AI Triage Engine - Rule-Based Severity Scoring
 Implements explicit point-based system matching flowchart logic.
 """
 
+from functools import lru_cache, reduce
+from operator import or_
 from typing import Optional
 
+import numpy as np
+
+try:
+    from numba import njit, prange
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+    prange = range
+
 # RED FLAGS: Immediate Level 3 escalation
-RED_FLAGS = {
+RED_FLAGS = frozenset({
     "trouble_breathing",
     "choking",
     "turning_blue",
@@ -21,7 +32,7 @@ RED_FLAGS = {
     "heavy_bleeding",
     "anaphylaxis_signs",
     "severe_allergy_swelling",
-}
+})
 
 # SYMPTOM POINT VALUES: Explicit scoring system
 SYMPTOM_POINTS = {
@@ -77,40 +88,40 @@ SYMPTOM_POINTS = {
 
 # CATEGORY RULES: Maps symptoms to medical categories
 CATEGORY_RULES = {
-    "trauma_bleeding": {
+    "trauma_bleeding": frozenset({
         "severe_bleeding", "heavy_bleeding", "moderate_bleeding",
         "major_trauma", "head_injury"
-    },
-    "cardiac": {
+    }),
+    "cardiac": frozenset({
         "chest_pain", "chest_pain_crushing", "palpitations"
-    },
-    "respiratory": {
+    }),
+    "respiratory": frozenset({
         "shortness_of_breath", "wheezing", "choking",
         "trouble_breathing", "turning_blue"
-    },
-    "neuro": {
+    }),
+    "neuro": frozenset({
         "seizure_now", "fainting", "face_droop", "slurred_speech",
         "arm_weakness", "stroke_signs", "confusion", "unconscious",
         "not_responding"
-    },
-    "allergic": {
+    }),
+    "allergic": frozenset({
         "rash", "swelling_face_lips", "anaphylaxis_signs",
         "severe_allergy_swelling"
-    },
-    "infection_fever": {
+    }),
+    "infection_fever": frozenset({
         "fever", "high_fever", "chills"
-    },
-    "gi_dehydration": {
+    }),
+    "gi_dehydration": frozenset({
         "vomiting", "vomiting_severe", "diarrhea", "diarrhea_severe",
         "dehydration", "nausea"
-    },
-    "mental_health": {
+    }),
+    "mental_health": frozenset({
         "panic", "severe_distress"
-    },
+    }),
 }
 
 # CATEGORY PRIORITY: In case of multiple matches, pick highest priority
-PRIORITY = [
+PRIORITY = (
     "trauma_bleeding",
     "cardiac",
     "respiratory",
@@ -119,48 +130,205 @@ PRIORITY = [
     "infection_fever",
     "gi_dehydration",
     "mental_health",
-]
+)
 
 # FOLLOW-UP QUESTIONS: Asked when Level 0 (insufficient info)
-FOLLOWUP_QUESTIONS = [
+FOLLOWUP_QUESTIONS = (
     "What is the main symptom?",
     "How long has it been happening?",
     "Is the person conscious and breathing normally?",
     "Is there any bleeding or visible injury?",
     "Can the person speak in full sentences?",
-]
+)
+
+# Level 0 response (no symptoms, no text); triage copies it and fills in duration_minutes
+_EMPTY_RESPONSE = {
+    "category": "other_unclear",
+    "severity_level": 0,
+    "escalate_human": False,
+    "confidence": 0.0,
+    "followup_questions": FOLLOWUP_QUESTIONS,
+    "score_breakdown": {
+        "symptom_score": 0,
+        "voice_bonus": 0,
+        "total_score": 0,
+        "red_flag_detected": False,
+        "duration_minutes": None,
+    },
+}
 
+# SEVERITY BY SCORE: index is the total score; anything past the table is Level 3
+_LEVEL_TABLE = (0,) + (1,) * 2 + (2,) * 2 + (3,) * 32
 
-def pick_category(symptoms: set[str]) -> str:
+# BATCH CATEGORY IDS: index into PRIORITY, with "other_unclear" last (see triage_batch)
+BATCH_CATEGORIES = PRIORITY + ("other_unclear",)
+
+# CATEGORY BITS: PRIORITY[0] gets bit 0, so the lowest set bit is the winning category
+CAT_BIT = {cat: 1 << i for i, cat in enumerate(PRIORITY)}
+
+# SYMPTOM -> OR of the bits of every category listing it
+SYMPTOM_CAT_MASK = {
+    symptom: reduce(or_, (CAT_BIT[cat] for cat, cat_symptoms in CATEGORY_RULES.items() if symptom in cat_symptoms), 0)
+    for symptom_set in CATEGORY_RULES.values()
+    for symptom in symptom_set
+}
+
+
+def _build_symptom_index() -> dict[str, tuple[int, int, bool]]:
     """
-    Assign category based on symptom matching.
-    Uses priority order if multiple categories match.
+    Flatten SYMPTOM_POINTS, CATEGORY_RULES and RED_FLAGS into
+    symptom -> (points, category bitmask, is_red_flag) for single-pass triage.
     """
-    hits = []
-    for cat, symptom_set in CATEGORY_RULES.items():
-        if symptoms & symptom_set:
-            hits.append(cat)
+    symptoms = set(SYMPTOM_POINTS) | RED_FLAGS
+    for symptom_set in CATEGORY_RULES.values():
+        symptoms |= symptom_set
     
-    if not hits:
+    return {
+        symptom: (SYMPTOM_POINTS.get(symptom, 0), SYMPTOM_CAT_MASK.get(symptom, 0), symptom in RED_FLAGS)
+        for symptom in symptoms
+    }
+
+
+SYMPTOM_INDEX = _build_symptom_index()
+
+# SYMPTOM BITS: each known symptom gets one bit of an int symptom mask (see symptom_mask)
+SYMPTOM_ID = {symptom: i for i, symptom in enumerate(sorted(SYMPTOM_INDEX))}
+POINTS_ARR = tuple(SYMPTOM_INDEX[symptom][0] for symptom in SYMPTOM_ID)
+CAT_MASK_ARR = tuple(SYMPTOM_INDEX[symptom][1] for symptom in SYMPTOM_ID)
+RED_FLAG_MASK = sum(1 << SYMPTOM_ID[symptom] for symptom in RED_FLAGS)
+
+
+def _category_from_mask(cat_mask: int) -> str:
+    """Highest-priority category in a category bitmask (lowest set bit)"""
+    if not cat_mask:
         return "other_unclear"
+    return PRIORITY[(cat_mask & -cat_mask).bit_length() - 1]
+
+
+def _iter_bits(mask: int):
+    """Yield the index of each set bit in mask, lowest first"""
+    while mask:
+        low = mask & -mask
+        yield low.bit_length() - 1
+        mask ^= low
+
+
+def _score_mask_python(mask, red_mask, points, cat_masks) -> tuple[int, int, bool]:
+    """(symptom score, category bitmask, red flag) for a symptom mask"""
+    score = 0
+    cat_mask = 0
+    for symptom_id in _iter_bits(mask):
+        score += points[symptom_id]
+        cat_mask |= cat_masks[symptom_id]
+    return score, cat_mask, (mask & red_mask) != 0
+
+
+# Compiled kernel needs masks that fit in int64
+if NUMBA_AVAILABLE and len(SYMPTOM_ID) < 64:
+    @njit(cache=True)
+    def _score_mask(mask, red_mask, points, cat_masks):
+        """Compiled bit loop version of _score_mask_python."""
+        score = 0
+        cat_mask = 0
+        remaining = mask
+        symptom_id = 0
+        while remaining:
+            if remaining & 1:
+                score += points[symptom_id]
+                cat_mask |= cat_masks[symptom_id]
+            remaining >>= 1
+            symptom_id += 1
+        return score, cat_mask, (mask & red_mask) != 0
+    
+    _SCORE_POINTS = np.array(POINTS_ARR, dtype=np.int64)
+    _SCORE_CAT_MASKS = np.array(CAT_MASK_ARR, dtype=np.int64)
+else:
+    _score_mask = _score_mask_python
+    _SCORE_POINTS = POINTS_ARR
+    _SCORE_CAT_MASKS = CAT_MASK_ARR
+
+
+def _triage_batch_kernel(masks, high_voice, red_mask, points, cat_masks, level_table, n_priority):
+    """Per-case category id, severity and escalation (same rules as _triage_core)."""
+    n = len(masks)
+    category = np.empty(n, dtype=np.int8)
+    severity = np.empty(n, dtype=np.int8)
+    escalate = np.empty(n, dtype=np.bool_)
+    for i in prange(n):
+        base_score, cat_mask, red_flag = _score_mask(masks[i], red_mask, points, cat_masks)
+        total_score = base_score + (1 if (base_score > 0 and high_voice[i]) else 0)
+        
+        if not red_flag and total_score < len(level_table):
+            level = level_table[total_score]
+        else:
+            level = 3
+        severity[i] = level
+        escalate[i] = level == 3
+        
+        # Lowest set category bit wins; no bits means other_unclear
+        cat_id = n_priority
+        if cat_mask:
+            cat_id = 0
+            while not (cat_mask >> cat_id) & 1:
+                cat_id += 1
+        category[i] = cat_id
+    return category, severity, escalate
+
+
+if _score_mask is not _score_mask_python:
+    _triage_batch_kernel = njit(parallel=True, cache=True)(_triage_batch_kernel)
+    _BATCH_LEVELS = np.array(_LEVEL_TABLE, dtype=np.int64)
+else:
+    _BATCH_LEVELS = _LEVEL_TABLE
+
+
+def triage_batch(masks: np.ndarray, voice_stress_scores: np.ndarray) -> np.recarray:
+    """
+    Vectorized triage decision for many pre-encoded cases.
+    Free text and duration don't change these fields, so only the
+    symptom masks and voice stress are needed.
     
-    # Return highest priority match
-    for cat in PRIORITY:
-        if cat in hits:
-            return cat
+    Args:
+        masks: int64 symptom bitmasks (see symptom_mask), one per case
+        voice_stress_scores: Voice stress per case (NaN where unknown)
     
-    return hits[0]
+    Returns:
+        Record array with fields:
+        - category: int8 index into BATCH_CATEGORIES
+        - severity: int8 level 0-3
+        - escalate: bool
+    
+    Raises:
+        ValueError: If a mask has bits outside SYMPTOM_ID
+    """
+    if len(SYMPTOM_ID) > 63:
+        raise ValueError(f"{len(SYMPTOM_ID)} symptoms don't fit in int64 masks; use triage_mask per case")
+    
+    high_voice = np.asarray(voice_stress_scores, dtype=np.float64) >= 0.80
+    masks = np.asarray(masks, dtype=np.int64)
+    # The kernel doesn't bounds-check symptom ids; negative masks shift to -1
+    if np.any(masks >> len(SYMPTOM_ID)):
+        raise ValueError(f"symptom masks must be in [0, 1 << {len(SYMPTOM_ID)})")
+    if _score_mask is _score_mask_python:
+        masks = masks.tolist()  # Python ints, for int.bit_length()
+    
+    category, severity, escalate = _triage_batch_kernel(
+        masks, high_voice, RED_FLAG_MASK, _SCORE_POINTS, _SCORE_CAT_MASKS, _BATCH_LEVELS, len(PRIORITY),
+    )
+    return np.rec.fromarrays([category, severity, escalate], names="category,severity,escalate")
 
 
-def calculate_symptom_score(symptoms: set[str]) -> int:
+def symptom_mask(symptoms) -> int:
     """
-    Calculate total symptom score based on point values.
-    Each symptom contributes its assigned points.
+    Encode symptom identifiers as an int bitmask over SYMPTOM_ID.
+    Unknown symptoms are dropped (they carry no points or category).
     """
-    score = 0
+    mask = 0
     for symptom in symptoms:
-        score += SYMPTOM_POINTS.get(symptom, 0)
-    return score
+        symptom_id = SYMPTOM_ID.get(symptom)
+        if symptom_id is not None:
+            mask |= 1 << symptom_id
+    return mask
 
 
 def map_score_to_severity(score: int) -> int:
@@ -173,51 +341,7 @@ def map_score_to_severity(score: int) -> int:
     - 3-4 points → Level 2 (medium)
     - 5+ points → Level 3 (high/emergency)
     """
-    if score == 0:
-        return 0
-    elif score <= 2:
-        return 1
-    elif score <= 4:
-        return 2
-    else:
-        return 3
-
-
-def compute_severity(
-    symptoms: set[str],
-    voice_stress_score: Optional[float],
-) -> tuple[int, bool]:
-    """
-    Compute severity level and escalation flag.
-    
-    Logic:
-    1. Red flag present → Level 3, escalate immediately
-    2. Calculate symptom score
-    3. Add +1 if voice stress ≥ 0.80 AND score > 0
-    4. Map score to severity level
-    5. Escalate if Level 3
-    
-    Returns:
-        (severity_level, escalate_flag)
-    """
-    # Fast path: red flag detected
-    if symptoms & RED_FLAGS:
-        return 3, True
-    
-    # Calculate base symptom score
-    score = calculate_symptom_score(symptoms)
-    
-    # Add voice stress bonus (only if symptoms present)
-    if score > 0 and voice_stress_score is not None and voice_stress_score >= 0.80:
-        score += 1
-    
-    # Map to severity level
-    severity = map_score_to_severity(score)
-    
-    # Escalate if Level 3
-    escalate = (severity == 3)
-    
-    return severity, escalate
+    return _LEVEL_TABLE[score] if score < len(_LEVEL_TABLE) else 3
 
 
 def triage(
@@ -228,6 +352,7 @@ def triage(
 ) -> dict:
     """
     Main triage function.
+    Encodes the symptoms once with symptom_mask, then runs triage_mask.
     
     Args:
         symptoms: List of symptom identifiers
@@ -241,39 +366,89 @@ def triage(
         - severity_level: 0-3
         - escalate_human: bool
         - confidence: 0.0-1.0
-        - followup_questions: list (if Level 0)
+        - followup_questions: tuple of questions (if Level 0)
         - score_breakdown: dict with scoring details
     """
-    sym = set(symptoms)
+    return triage_mask(symptom_mask(symptoms), free_text, duration_minutes, voice_stress_score)
+
+
+def triage_mask(
+    mask: int,
+    free_text: str,
+    duration_minutes: Optional[int] = None,
+    voice_stress_score: Optional[float] = None,
+) -> dict:
+    """
+    Triage from a pre-encoded symptom bitmask (see symptom_mask).
+    Batch callers can encode each case once and skip per-call set building;
+    membership checks become bitwise ANDs. Same output as triage().
+    
+    Args:
+        mask: Symptom bitmask from symptom_mask
+        free_text: Optional text description
+        duration_minutes: How long symptoms have been present
+        voice_stress_score: 0.0 to 1.0, from voice analysis
+    
+    Raises:
+        ValueError: If mask has bits outside SYMPTOM_ID
+    """
+    if not 0 <= mask < 1 << len(SYMPTOM_ID):
+        raise ValueError(f"symptom mask must be in [0, 1 << {len(SYMPTOM_ID)}), got {mask}")
     
     # Level 0: Insufficient information
-    if not sym and not (free_text or "").strip():
-        return {
-            "category": "other_unclear",
-            "severity_level": 0,
-            "escalate_human": False,
-            "confidence": 0.0,
-            "followup_questions": FOLLOWUP_QUESTIONS,
-            "score_breakdown": {
-                "symptom_score": 0,
-                "voice_bonus": 0,
-                "total_score": 0,
-                "red_flag_detected": False,
-                "duration_minutes": duration_minutes,
-            },
-        }
+    # (unknown-only symptom lists encode to 0 and score the same as no symptoms)
+    if not mask and not (free_text or "").strip():
+        response = _EMPTY_RESPONSE.copy()
+        response["score_breakdown"] = {**_EMPTY_RESPONSE["score_breakdown"], "duration_minutes": duration_minutes}
+        return response
     
-    # Assign category
-    category = pick_category(sym)
+    category, severity, escalate, confidence, base_score, voice_bonus, red_flag = _triage_core(
+        mask,
+        voice_stress_score is not None and voice_stress_score >= 0.80,
+    )
     
-    # Calculate severity and escalation
-    severity, escalate = compute_severity(sym, voice_stress_score)
+    return {
+        "category": category,
+        "severity_level": severity,
+        "escalate_human": escalate,
+        "confidence": confidence,
+        "followup_questions": () if severity > 0 else FOLLOWUP_QUESTIONS,
+        "score_breakdown": {
+            "symptom_score": base_score,
+            "voice_bonus": voice_bonus,
+            "total_score": base_score + voice_bonus,
+            "red_flag_detected": red_flag,
+            "duration_minutes": duration_minutes,
+        },
+    }
+
+
+@lru_cache(maxsize=4096)
+def _triage_core(mask: int, high_voice_stress: bool) -> tuple:
+    """
+    Memoized triage decision for non-empty input. The inputs are everything
+    the decision depends on (duration is only echoed back), so repeated
+    cases are a cache hit.
+    
+    Returns:
+        (category, severity, escalate, confidence, symptom_score, voice_bonus, red_flag)
+    """
+    # Single pass over set bits: symptom score, category bits and red flag together
+    base_score, cat_mask, red_flag = _score_mask(mask, RED_FLAG_MASK, _SCORE_POINTS, _SCORE_CAT_MASKS)
+    
+    # Assign category
+    category = _category_from_mask(cat_mask)
     
     # Calculate score breakdown for transparency
-    base_score = calculate_symptom_score(sym)
-    voice_bonus = 1 if (base_score > 0 and voice_stress_score is not None and voice_stress_score >= 0.80) else 0
+    voice_bonus = 1 if (base_score > 0 and high_voice_stress) else 0
     total_score = base_score + voice_bonus
-    red_flag = bool(sym & RED_FLAGS)
+    
+    # Severity and escalation: red flag → Level 3, else score mapped to level
+    if red_flag:
+        severity, escalate = 3, True
+    else:
+        severity = map_score_to_severity(total_score)
+        escalate = (severity == 3)
     
     # Confidence heuristic
     if severity == 0:
@@ -285,17 +460,4 @@ def triage(
     else:
         confidence = 0.65
     
-    return {
-        "category": category,
-        "severity_level": severity,
-        "escalate_human": escalate,
-        "confidence": confidence,
-        "followup_questions": [] if severity > 0 else FOLLOWUP_QUESTIONS,
-        "score_breakdown": {
-            "symptom_score": base_score,
-            "voice_bonus": voice_bonus,
-            "total_score": total_score,
-            "red_flag_detected": red_flag,
-            "duration_minutes": duration_minutes,
-        },
-    }
\ No newline at end of file
+    return category, severity, escalate, confidence, base_score, voice_bonus, red_flag
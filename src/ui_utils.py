@@ -5,62 +5,69 @@ Contains timeline visualization for dispatch decisions.
 
 import streamlit as st
 from streamlit_timeline import timeline
-from datetime import datetime, timedelta
 
+# Timeline starts at 2024-01-01 12:00:00; offsets only move the day and clock
+_FIXED_DATE = {"year": "2024", "month": "1", "day": "1"}
+_BASE_SECONDS = 12 * 3600
 
-def render_response_timeline(ground_eta: float, air_eta: float, harm_threshold: float):
+
+def _time_dict(minutes: float) -> dict:
+    """TimelineJS date dict (string fields) for base time + minutes (under 30 days)."""
+    # Same whole second as datetime + timedelta, which rounds to the microsecond
+    total = round(minutes * 60_000_000) // 1_000_000 + _BASE_SECONDS
+    days, rest = divmod(total, 86400)
+    hour, rem = divmod(rest, 3600)
+    minute, second = divmod(rem, 60)
+    return {
+        **_FIXED_DATE, "day": str(1 + days),
+        "hour": str(hour), "minute": str(minute), "second": str(second),
+    }
+
+
+@st.cache_data(max_entries=128)
+def _build_events(ground_eta: float, air_eta: float, harm_threshold: float) -> dict:
     """
-    Render a timeline of response vs harm window.
+    Build the TimelineJS data dict, cached across reruns.
     
     Args:
         ground_eta: Ambulance ETA in minutes
-        air_eta: Drone ETA in minutes  
+        air_eta: Drone ETA in minutes
         harm_threshold: Time to irreversible harm in minutes
     """
-    base_time = datetime(2024, 1, 1, 12, 0, 0)
+    # (minutes after call, headline, text, group)
+    milestones = [
+        (air_eta, "Drone Arrival", f"T+{air_eta:.1f} min: Immediate Care", "Response"),
+        (harm_threshold, "Harm Threshold", f"T+{harm_threshold:.0f} min: Irreversible Damage Begins", "Critical Limits"),
+        (ground_eta, "Ambulance Arrival", f"T+{ground_eta:.1f} min: Ground Transport", "Response"),
+    ]
     
     events = [
         {
-            "start_date": {"year": "2024", "month": "1", "day": "1", "hour": "12", "minute": "0", "second": "0"},
+            "start_date": _time_dict(0),
             "text": {"headline": "Emergency Call", "text": "T=0: System Activation"},
             "group": "Events"
         }
+    ] + [
+        {
+            "start_date": _time_dict(minutes),
+            "text": {"headline": headline, "text": text},
+            "group": group
+        }
+        for minutes, headline, text, group in milestones
     ]
     
+    return {"events": events}
+
+
+def render_response_timeline(ground_eta: float, air_eta: float, harm_threshold: float):
+    """
+    Render a timeline of response vs harm window.
     
-    drone_time = base_time + timedelta(minutes=air_eta)
-    events.append({
-        "start_date": {
-            "year": str(drone_time.year), "month": str(drone_time.month), "day": str(drone_time.day),
-            "hour": str(drone_time.hour), "minute": str(drone_time.minute), "second": str(drone_time.second)
-        },
-        "text": {"headline": "Drone Arrival", "text": f"T+{air_eta:.1f} min: Immediate Care"},
-        "group": "Response"
-    })
-    
-    
-    harm_time = base_time + timedelta(minutes=harm_threshold)
-    events.append({
-        "start_date": {
-            "year": str(harm_time.year), "month": str(harm_time.month), "day": str(harm_time.day),
-            "hour": str(harm_time.hour), "minute": str(harm_time.minute), "second": str(harm_time.second)
-        },
-        "text": {"headline": "Harm Threshold", "text": f"T+{harm_threshold:.0f} min: Irreversible Damage Begins"},
-        "group": "Critical Limits"
-    })
-    
-    
-    amb_time = base_time + timedelta(minutes=ground_eta)
-    events.append({
-        "start_date": {
-            "year": str(amb_time.year), "month": str(amb_time.month), "day": str(amb_time.day),
-            "hour": str(amb_time.hour), "minute": str(amb_time.minute), "second": str(amb_time.second)
-        },
-        "text": {"headline": "Ambulance Arrival", "text": f"T+{ground_eta:.1f} min: Ground Transport"},
-        "group": "Response"
-    })
-    
-    data = {"events": events}
-    
+    Args:
+        ground_eta: Ambulance ETA in minutes
+        air_eta: Drone ETA in minutes  
+        harm_threshold: Time to irreversible harm in minutes
+    """
+    data = _build_events(ground_eta, air_eta, harm_threshold)
     
     timeline(data, height=300)
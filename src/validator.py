@@ -8,19 +8,82 @@ Uses normalized labels for comparison and provides detailed mismatch analysis.
 Run with: python validator.py
 """
 
-from typing import List, Dict, Tuple
-from dataclasses import dataclass, field
+from typing import Callable, List, Dict, Tuple
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict, dataclass, field
+from functools import lru_cache, wraps
+import hashlib
+import io
 import json
+import os
+import pickle
+import sys
 from datetime import datetime
+from pathlib import Path
 import logging
 
-from .data_loader import load_scenarios, load_cases
-from .dispatch_engine import dispatch, DispatchResult
+import numpy as np
+
+from .data_loader import FILES_DIR, dispatch_table, load_scenarios, load_cases
+from .dispatch_engine import (
+    RULE_CONFIDENCE,
+    RULE_MODE,
+    RULE_ORDER,
+    rule_flags,
+    rule_indices,
+    rule_reasons,
+)
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
 
 logger = logging.getLogger(__name__)
 
+# Validation reports are pickled here (user cache dir, outside the source tree),
+# keyed by dataset path/mtime and engine source
+CACHE_DIR = Path(os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache") / "sahm"
+
+# Modules whose code decides the report; editing any of them invalidates cached reports
+_ENGINE_SOURCES = ("dispatch_engine.py", "data_loader.py", "validator.py")
+
+
+@dataclass(slots=True)
+class ValidationDetails:
+    """
+    Engine inputs and reasoning behind a single validation result.
+    
+    Attributes:
+        rule_triggered: Dispatch rule that decided the outcome
+        confidence: Confidence of that rule
+        weather_risk_pct: Weather risk input (%)
+        harm_threshold_min: Harm threshold input (minutes)
+        ground_eta_min: Ambulance ETA input (minutes)
+        air_eta_min: Drone ETA input (minutes)
+        time_delta_min: Ground ETA minus air ETA
+        exceeds_weather: Weather risk above WEATHER_RISK_THRESHOLD
+        exceeds_harm: Ground ETA above the harm threshold
+        exceeds_efficiency: Time delta above EFFICIENCY_TIME_DELTA
+        expected_rationale: Rationale recorded with the expected decision
+        actual_reasons: Reasons the engine gave for its decision
+    """
+    rule_triggered: str
+    confidence: float
+    weather_risk_pct: float
+    harm_threshold_min: float
+    ground_eta_min: float
+    air_eta_min: float
+    time_delta_min: float
+    exceeds_weather: bool
+    exceeds_harm: bool
+    exceeds_efficiency: bool
+    expected_rationale: str
+    actual_reasons: List[str]
+
 
-@dataclass
+@dataclass(slots=True)
 class ValidationResult:
     """
     Result of a single validation test.
@@ -31,17 +94,17 @@ class ValidationResult:
         expected: Expected decision (DOCTOR_DRONE or AMBULANCE)
         actual: Actual decision from engine
         match: Whether expected matches actual
-        details: Additional test details and reasoning
+        details: Engine inputs and reasoning for this test
     """
     id: str
     name: str
     expected: str
     actual: str
     match: bool
-    details: Dict = field(default_factory=dict)
+    details: ValidationDetails
 
 
-@dataclass
+@dataclass(slots=True)
 class ValidationReport:
     """
     Summary report of validation run.
@@ -51,7 +114,8 @@ class ValidationReport:
         total: Total number of tests
         matches: Number of matching results
         mismatches: Number of mismatching results
-        results: List of individual test results
+        results: Individual results for the mismatching tests only
+            (matches are just counted)
         timestamp: When validation was run
     """
     source: str
@@ -72,157 +136,244 @@ class ValidationReport:
         return f"{self.matches}/{self.total}"
 
 
+# =============================================================================
+# REPORT CACHE
+# =============================================================================
+
+@lru_cache(maxsize=1)
+def _engine_fingerprint() -> str:
+    """Hash of the modules that produce a report (see _ENGINE_SOURCES)."""
+    digest = hashlib.sha1()
+    for name in _ENGINE_SOURCES:
+        digest.update((Path(__file__).parent / name).read_bytes())
+    return digest.hexdigest()
+
+
+def _mtime_cache(data_file: str) -> Callable:
+    """
+    Cache a validate_* function's report on disk until its dataset changes.
+    
+    The key is the data file's path, mtime_ns and size plus
+    _engine_fingerprint(), so edits to the data or to the engine force a
+    fresh run. Reports are stored as plain dicts (without the timestamp,
+    which is stamped fresh on every call) so they load regardless of how
+    the module was imported.
+    
+    Args:
+        data_file: Dataset filename inside FILES_DIR
+    """
+    def decorator(func: Callable[[], "ValidationReport"]) -> Callable[[], "ValidationReport"]:
+        @wraps(func)
+        def wrapper() -> "ValidationReport":
+            path = FILES_DIR / data_file
+            try:
+                stat = path.stat()
+            except OSError:
+                return func()  # Let the loader report the missing file
+            
+            key = (str(path.resolve()), stat.st_mtime_ns, stat.st_size, _engine_fingerprint())
+            cache_path = CACHE_DIR / f"{path.stem}_report.pkl"
+            
+            try:
+                with open(cache_path, "rb") as f:
+                    cached_key, cached = pickle.load(f)
+                if cached_key == key:
+                    logger.info(f"Using cached report for {data_file}")
+                    return _report_from_dict(cached)
+            except FileNotFoundError:
+                pass
+            except Exception as e:
+                logger.warning(f"Ignoring unreadable report cache {cache_path}: {e}")
+            
+            report = func()
+            try:
+                cache_path.parent.mkdir(parents=True, exist_ok=True)
+                with open(cache_path, "wb") as f:
+                    pickle.dump((key, _report_to_dict(report)), f, protocol=pickle.HIGHEST_PROTOCOL)
+            except OSError as e:
+                logger.warning(f"Could not write report cache {cache_path}: {e}")
+            return report
+        
+        return wrapper
+    
+    return decorator
+
+
+def _report_to_dict(report: "ValidationReport") -> Dict:
+    """asdict() form of a report, minus the per-run timestamp."""
+    data = asdict(report)
+    del data["timestamp"]
+    return data
+
+
+def _report_from_dict(data: Dict) -> "ValidationReport":
+    """Rebuild a ValidationReport (with a new timestamp) from _report_to_dict()."""
+    results = [
+        ValidationResult(**{**r, "details": ValidationDetails(**r["details"])})
+        for r in data["results"]
+    ]
+    return ValidationReport(**{**data, "results": results})
+
+
 # =============================================================================
 # VALIDATION FUNCTIONS
 # =============================================================================
 
-def validate_scenarios() -> ValidationReport:
+def _evaluate_rules(table: np.recarray) -> Tuple[np.ndarray, np.ndarray]:
     """
-    Validate all entries in scenarios.json.
+    Evaluate the dispatch rules for every row in one vectorized pass.
+    Uses the engine's own rule_indices, so it decides exactly as dispatch().
     
-    Tests each scenario against the dispatch engine and compares
-    the actual decision with the expected decision.
+    Args:
+        table: Dispatch inputs from data_loader.dispatch_table
     
     Returns:
-        ValidationReport with detailed results
+        (rule index into RULE_ORDER, decision) arrays aligned with table
     """
-    logger.info("Starting scenarios validation...")
+    rule_idx = rule_indices(table.weather, table.harm, table.ground, table.air)
+    decisions = np.array([RULE_MODE[rule] for rule in RULE_ORDER])[rule_idx]
+    return rule_idx, decisions
+
+
+def _validate_records(
+    records: List[Dict],
+    source: str,
+    id_label: str,
+    id_key: str,
+    name_key: str,
+    rationale_key: str,
+) -> ValidationReport:
+    """
+    Validate records against the dispatch rules and build the report.
     
-    scenarios = load_scenarios()
-    results = []
+    Args:
+        records: Normalized scenarios or cases
+        source: Report source name
+        id_label, id_key: Result id is f"{id_label} {record[id_key]}"
+        name_key: Record field used as the result name
+        rationale_key: Record field holding the expected rationale
+    """
+    table = dispatch_table(records)
+    rule_idx, decisions = _evaluate_rules(table)
     
-    for scenario in scenarios:
-        # Run dispatch with scenario parameters
-        result = dispatch(
-            weather_risk_pct=scenario["weather_risk_pct"],
-            harm_threshold_min=scenario["harm_threshold_min"],
-            ground_eta_min=scenario["ground_eta_min"],
-            air_eta_min=scenario["air_eta_min"],
-        )
-        
-        # Compare decisions (both are normalized)
-        expected = scenario["expected_decision"]
-        actual = result.response_mode
-        match = (expected == actual)
+    # Compare decisions (both are normalized)
+    match = table.expected == decisions
+    matches = int(np.count_nonzero(match))
+    
+    # Matches are only counted; results are built for mismatches
+    results = []
+    for i in np.flatnonzero(~match).tolist():
+        record = records[i]
+        rule = RULE_ORDER[rule_idx[i]]
+        weather = record["weather_risk_pct"]
+        harm = record["harm_threshold_min"]
+        ground = record["ground_eta_min"]
+        air = record["air_eta_min"]
+        time_delta = ground - air
+        exceeds_weather, exceeds_harm, exceeds_efficiency = rule_flags(weather, harm, ground, air)
         
         # Build detailed information
-        details = {
-            "rule_triggered": result.rule_triggered,
-            "confidence": result.confidence,
-            "weather_risk_pct": scenario["weather_risk_pct"],
-            "harm_threshold_min": scenario["harm_threshold_min"],
-            "ground_eta_min": scenario["ground_eta_min"],
-            "air_eta_min": scenario["air_eta_min"],
-            "time_delta_min": result.time_delta_min,
-            "exceeds_weather": result.exceeds_weather,
-            "exceeds_harm": result.exceeds_harm,
-            "exceeds_efficiency": result.exceeds_efficiency,
-            "expected_rationale": scenario.get("rationale", ""),
-            "actual_reasons": result.reasons,
-        }
+        details = ValidationDetails(
+            rule_triggered=rule,
+            confidence=RULE_CONFIDENCE[rule],
+            weather_risk_pct=weather,
+            harm_threshold_min=harm,
+            ground_eta_min=ground,
+            air_eta_min=air,
+            time_delta_min=time_delta,
+            exceeds_weather=exceeds_weather,
+            exceeds_harm=exceeds_harm,
+            exceeds_efficiency=exceeds_efficiency,
+            expected_rationale=record.get(rationale_key, ""),
+            actual_reasons=rule_reasons(rule, weather, harm, ground, air, time_delta),
+        )
         
         results.append(ValidationResult(
-            id=f"Scenario {scenario['scenario_id']}",
-            name=scenario["emergency_case"],
-            expected=expected,
-            actual=actual,
-            match=match,
+            id=f"{id_label} {record[id_key]}",
+            name=record[name_key],
+            expected=record["expected_decision"],
+            actual=str(decisions[i]),
+            match=False,
             details=details,
         ))
     
-    matches = sum(1 for r in results if r.match)
-    
-    logger.info(f"Scenarios validation complete: {matches}/{len(results)} passed")
-    
     return ValidationReport(
-        source="scenarios.json",
-        total=len(results),
+        source=source,
+        total=len(records),
         matches=matches,
-        mismatches=len(results) - matches,
+        mismatches=len(results),
         results=results,
     )
 
 
-def validate_cases() -> ValidationReport:
+@_mtime_cache("scenarios.json")
+def validate_scenarios() -> ValidationReport:
     """
-    Validate all entries in cases_send_decision.json.
+    Validate all entries in scenarios.json.
     
-    Tests each case against the dispatch engine and compares
-    the actual decision with the expected decision.
+    Evaluates every scenario against the dispatch rules in one batch and
+    compares the actual decision with the expected decision.
     
     Returns:
-        ValidationReport with detailed results
+        ValidationReport with mismatch details
     """
-    logger.info("Starting cases validation...")
+    logger.info("Starting scenarios validation...")
     
-    cases = load_cases()
-    results = []
+    report = _validate_records(
+        load_scenarios(),
+        source="scenarios.json",
+        id_label="Scenario",
+        id_key="scenario_id",
+        name_key="emergency_case",
+        rationale_key="rationale",
+    )
     
-    for case in cases:
-        # Run dispatch with case parameters
-        result = dispatch(
-            weather_risk_pct=case["weather_risk_pct"],
-            harm_threshold_min=case["harm_threshold_min"],
-            ground_eta_min=case["ground_eta_min"],
-            air_eta_min=case["air_eta_min"],
-        )
-        
-        # Compare decisions (both are normalized)
-        expected = case["expected_decision"]
-        actual = result.response_mode
-        match = (expected == actual)
-        
-        # Build detailed information
-        details = {
-            "rule_triggered": result.rule_triggered,
-            "confidence": result.confidence,
-            "weather_risk_pct": case["weather_risk_pct"],
-            "harm_threshold_min": case["harm_threshold_min"],
-            "ground_eta_min": case["ground_eta_min"],
-            "air_eta_min": case["air_eta_min"],
-            "time_delta_min": result.time_delta_min,
-            "exceeds_weather": result.exceeds_weather,
-            "exceeds_harm": result.exceeds_harm,
-            "exceeds_efficiency": result.exceeds_efficiency,
-            "expected_reasoning": case.get("reasoning", ""),
-            "actual_reasons": result.reasons,
-        }
-        
-        results.append(ValidationResult(
-            id=f"Case {case['case_id']}",
-            name=case["case_name"],
-            expected=expected,
-            actual=actual,
-            match=match,
-            details=details,
-        ))
+    logger.info(f"Scenarios validation complete: {report.matches}/{report.total} passed")
     
-    matches = sum(1 for r in results if r.match)
+    return report
+
+
+@_mtime_cache("cases_send_decision.json")
+def validate_cases() -> ValidationReport:
+    """
+    Validate all entries in cases_send_decision.json.
     
-    logger.info(f"Cases validation complete: {matches}/{len(results)} passed")
+    Evaluates every case against the dispatch rules in one batch and
+    compares the actual decision with the expected decision.
     
-    return ValidationReport(
+    Returns:
+        ValidationReport with mismatch details
+    """
+    logger.info("Starting cases validation...")
+    
+    report = _validate_records(
+        load_cases(),
         source="cases_send_decision.json",
-        total=len(results),
-        matches=matches,
-        mismatches=len(results) - matches,
-        results=results,
+        id_label="Case",
+        id_key="case_id",
+        name_key="case_name",
+        rationale_key="reasoning",
     )
+    
+    logger.info(f"Cases validation complete: {report.matches}/{report.total} passed")
+    
+    return report
 
 
 def run_full_validation() -> Tuple[ValidationReport, ValidationReport]:
     """
     Run validation on both scenarios and cases.
+    The two reports are independent, so they run concurrently.
     
     Returns:
         Tuple of (scenarios_report, cases_report)
     """
     logger.info("Running full validation suite...")
     
-    scenarios_report = validate_scenarios()
-    cases_report = validate_cases()
-    
-    return scenarios_report, cases_report
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        scenarios_future = executor.submit(validate_scenarios)
+        cases_future = executor.submit(validate_cases)
+        return scenarios_future.result(), cases_future.result()
 
 
 # =============================================================================
@@ -239,51 +390,53 @@ def print_validation_report(
     
     Args:
         report: ValidationReport to print
-        show_matches: Whether to show passing tests (default: False)
+        show_matches: Whether to show the pass count section (default: False);
+            per-test details are only kept for mismatches
         show_details: Whether to show detailed parameters (default: False)
     """
-    print(f"\n{'='*80}")
-    print(f"{report.source} Validation Report")
-    print(f"{'='*80}")
-    print(f"Timestamp: {report.timestamp}")
-    print(f"Results: {report.pass_rate} ({report.accuracy:.1f}% accuracy)")
-    print(f"  ✓ Matches: {report.matches}")
-    print(f"  ✗ Mismatches: {report.mismatches}")
+    # Build the whole report, then write it to stdout once
+    buf = io.StringIO()
+    
+    print(f"\n{'='*80}", file=buf)
+    print(f"{report.source} Validation Report", file=buf)
+    print(f"{'='*80}", file=buf)
+    print(f"Timestamp: {report.timestamp}", file=buf)
+    print(f"Results: {report.pass_rate} ({report.accuracy:.1f}% accuracy)", file=buf)
+    print(f"  ✓ Matches: {report.matches}", file=buf)
+    print(f"  ✗ Mismatches: {report.mismatches}", file=buf)
     
     # Show mismatches (always)
     if report.mismatches > 0:
-        print(f"\n{'─'*80}")
-        print("MISMATCHES:")
-        print(f"{'─'*80}")
+        print(f"\n{'─'*80}", file=buf)
+        print("MISMATCHES:", file=buf)
+        print(f"{'─'*80}", file=buf)
         
         for r in report.results:
             if not r.match:
-                print(f"\n  ✗ {r.id}: {r.name}")
-                print(f"      Expected: {r.expected}")
-                print(f"      Got: {r.actual} (Rule: {r.details.get('rule_triggered')})")
+                print(f"\n  ✗ {r.id}: {r.name}", file=buf)
+                print(f"      Expected: {r.expected}", file=buf)
+                print(f"      Got: {r.actual} (Rule: {r.details.rule_triggered})", file=buf)
                 
                 if show_details:
-                    print(f"      Parameters:")
-                    print(f"        Weather: {r.details.get('weather_risk_pct'):.1f}%")
-                    print(f"        Ground ETA: {r.details.get('ground_eta_min'):.1f} min")
-                    print(f"        Air ETA: {r.details.get('air_eta_min'):.1f} min")
-                    print(f"        Harm Limit: {r.details.get('harm_threshold_min')} min")
-                    print(f"        Time Delta: {r.details.get('time_delta_min'):.1f} min")
-                    print(f"      Thresholds:")
-                    print(f"        Weather: {r.details.get('exceeds_weather')}")
-                    print(f"        Harm: {r.details.get('exceeds_harm')}")
-                    print(f"        Efficiency: {r.details.get('exceeds_efficiency')}")
+                    print(f"      Parameters:", file=buf)
+                    print(f"        Weather: {r.details.weather_risk_pct:.1f}%", file=buf)
+                    print(f"        Ground ETA: {r.details.ground_eta_min:.1f} min", file=buf)
+                    print(f"        Air ETA: {r.details.air_eta_min:.1f} min", file=buf)
+                    print(f"        Harm Limit: {r.details.harm_threshold_min} min", file=buf)
+                    print(f"        Time Delta: {r.details.time_delta_min:.1f} min", file=buf)
+                    print(f"      Thresholds:", file=buf)
+                    print(f"        Weather: {r.details.exceeds_weather}", file=buf)
+                    print(f"        Harm: {r.details.exceeds_harm}", file=buf)
+                    print(f"        Efficiency: {r.details.exceeds_efficiency}", file=buf)
     
     # Show matches (optional)
     if show_matches and report.matches > 0:
-        print(f"\n{'─'*80}")
-        print("MATCHES:")
-        print(f"{'─'*80}")
-        
-        for r in report.results:
-            if r.match:
-                print(f"  ✓ {r.id}: {r.name}")
-                print(f"      Decision: {r.actual} (Rule: {r.details.get('rule_triggered')})")
+        print(f"\n{'─'*80}", file=buf)
+        print("MATCHES:", file=buf)
+        print(f"{'─'*80}", file=buf)
+        print(f"  ✓ {report.matches} test(s) matched the expected decision", file=buf)
+    
+    sys.stdout.write(buf.getvalue())
 
 
 def analyze_mismatches(report: ValidationReport) -> Dict:
@@ -299,29 +452,34 @@ def analyze_mismatches(report: ValidationReport) -> Dict:
     if report.mismatches == 0:
         return {"no_mismatches": True}
     
-    mismatches = [r for r in report.results if not r.match]
+    mismatches = report.results
     
-    # Count by rule that was actually triggered
+    # Single pass: rule counts, direction errors and totals for the averages
     rules_used = {}
-    for m in mismatches:
-        rule = m.details.get('rule_triggered', 'UNKNOWN')
-        rules_used[rule] = rules_used.get(rule, 0) + 1
-    
-    # Count by expected vs actual decision
     direction_errors = {
         "expected_drone_got_ambulance": 0,
         "expected_ambulance_got_drone": 0,
     }
+    weather_total = 0
+    time_delta_total = 0
     
     for m in mismatches:
+        # Count by rule that was actually triggered
+        rule = m.details.rule_triggered
+        rules_used[rule] = rules_used.get(rule, 0) + 1
+        
+        # Count by expected vs actual decision
         if m.expected == "DOCTOR_DRONE" and m.actual == "AMBULANCE":
             direction_errors["expected_drone_got_ambulance"] += 1
         elif m.expected == "AMBULANCE" and m.actual == "DOCTOR_DRONE":
             direction_errors["expected_ambulance_got_drone"] += 1
+        
+        weather_total += m.details.weather_risk_pct
+        time_delta_total += m.details.time_delta_min
     
     # Calculate average threshold exceedances for mismatches
-    avg_weather = sum(m.details.get('weather_risk_pct', 0) for m in mismatches) / len(mismatches)
-    avg_time_delta = sum(m.details.get('time_delta_min', 0) for m in mismatches) / len(mismatches)
+    avg_weather = weather_total / len(mismatches)
+    avg_time_delta = time_delta_total / len(mismatches)
     
     return {
         "total_mismatches": len(mismatches),
@@ -335,6 +493,8 @@ def analyze_mismatches(report: ValidationReport) -> Dict:
 def export_report_json(report: ValidationReport, filename: str) -> None:
     """
     Export validation report to JSON file.
+    Uses orjson (serializes the result dataclasses directly) when
+    installed, else the stdlib json module.
     
     Args:
         report: ValidationReport to export
@@ -349,21 +509,18 @@ def export_report_json(report: ValidationReport, filename: str) -> None:
             "mismatches": report.mismatches,
             "accuracy": report.accuracy,
         },
-        "results": [
-            {
-                "id": r.id,
-                "name": r.name,
-                "expected": r.expected,
-                "actual": r.actual,
-                "match": r.match,
-                "details": r.details,
-            }
-            for r in report.results
-        ],
+        "results": report.results,
     }
     
-    with open(filename, 'w') as f:
-        json.dump(data, f, indent=2)
+    if ORJSON_AVAILABLE:
+        payload = orjson.dumps(data, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS)
+        with open(filename, 'wb') as f:
+            f.write(payload)
+    else:
+        data["results"] = [asdict(r) for r in report.results]
+        # Same bytes as the orjson path: raw UTF-8, 2-space indent
+        with open(filename, 'w', encoding='utf-8') as f:
+            json.dump(data, f, indent=2, ensure_ascii=False)
     
     logger.info(f"Report exported to {filename}")
 
@@ -379,43 +536,48 @@ def print_combined_summary(
         scenarios_report: Scenarios validation report
         cases_report: Cases validation report
     """
+    # Build the whole summary, then write it to stdout once
+    buf = io.StringIO()
+    
     total = scenarios_report.total + cases_report.total
     matches = scenarios_report.matches + cases_report.matches
     mismatches = scenarios_report.mismatches + cases_report.mismatches
     accuracy = (matches / total * 100) if total > 0 else 0.0
     
-    print(f"\n{'='*80}")
-    print("COMBINED VALIDATION SUMMARY")
-    print(f"{'='*80}")
-    print(f"Total Tests: {total}")
-    print(f"  Scenarios: {scenarios_report.pass_rate} ({scenarios_report.accuracy:.1f}%)")
-    print(f"  Cases: {cases_report.pass_rate} ({cases_report.accuracy:.1f}%)")
-    print(f"\nOverall Accuracy: {matches}/{total} ({accuracy:.1f}%)")
+    print(f"\n{'='*80}", file=buf)
+    print("COMBINED VALIDATION SUMMARY", file=buf)
+    print(f"{'='*80}", file=buf)
+    print(f"Total Tests: {total}", file=buf)
+    print(f"  Scenarios: {scenarios_report.pass_rate} ({scenarios_report.accuracy:.1f}%)", file=buf)
+    print(f"  Cases: {cases_report.pass_rate} ({cases_report.accuracy:.1f}%)", file=buf)
+    print(f"\nOverall Accuracy: {matches}/{total} ({accuracy:.1f}%)", file=buf)
     
     if mismatches == 0:
-        print(f"\n🎉 ALL TESTS PASSED! 🎉")
-        print("The dispatch engine matches all expected decisions.")
+        print(f"\n🎉 ALL TESTS PASSED! 🎉", file=buf)
+        print("The dispatch engine matches all expected decisions.", file=buf)
     else:
-        print(f"\n⚠️  {mismatches} mismatch(es) found")
-        print("\nPossible causes:")
-        print("  • Dataset inconsistency (expected decision doesn't follow D1.md rules)")
-        print("  • Threshold values may need adjustment")
-        print("  • Edge cases at decision boundaries")
+        print(f"\n⚠️  {mismatches} mismatch(es) found", file=buf)
+        print("\nPossible causes:", file=buf)
+        print("  • Dataset inconsistency (expected decision doesn't follow D1.md rules)", file=buf)
+        print("  • Threshold values may need adjustment", file=buf)
+        print("  • Edge cases at decision boundaries", file=buf)
         
         # Analyze patterns
-        print("\nMismatch Analysis:")
+        print("\nMismatch Analysis:", file=buf)
         
         if scenarios_report.mismatches > 0:
             analysis = analyze_mismatches(scenarios_report)
-            print(f"\n  Scenarios:")
-            print(f"    Rules triggered: {analysis.get('rules_triggered', {})}")
-            print(f"    Direction errors: {analysis.get('direction_errors', {})}")
+            print(f"\n  Scenarios:", file=buf)
+            print(f"    Rules triggered: {analysis.get('rules_triggered', {})}", file=buf)
+            print(f"    Direction errors: {analysis.get('direction_errors', {})}", file=buf)
         
         if cases_report.mismatches > 0:
             analysis = analyze_mismatches(cases_report)
-            print(f"\n  Cases:")
-            print(f"    Rules triggered: {analysis.get('rules_triggered', {})}")
-            print(f"    Direction errors: {analysis.get('direction_errors', {})}")
+            print(f"\n  Cases:", file=buf)
+            print(f"    Rules triggered: {analysis.get('rules_triggered', {})}", file=buf)
+            print(f"    Direction errors: {analysis.get('direction_errors', {})}", file=buf)
+    
+    sys.stdout.write(buf.getvalue())
 
 
 # =============================================================================
@@ -0,0 +1,104 @@
+"""
+Canonical triage inputs shared by the test suites.
+Keyed scenarios are referenced by TEST_CASES (cases.py) and the
+pipeline tests, so repeated inputs hit the same triage cache entry.
+"""
+
+CANONICAL = {
+    "bleeding_severe": {
+        "symptoms": ["severe_bleeding"],
+        "free_text": "Deep cut on arm, blood won't stop with pressure",
+        "duration_minutes": 5,
+        "voice_stress_score": 0.75,
+    },
+    "chest_pain_crushing": {
+        "symptoms": ["chest_pain_crushing"],
+        "free_text": "Crushing pressure in chest, radiating to left arm, sweating",
+        "duration_minutes": 20,
+        "voice_stress_score": 0.85,
+    },
+    "stroke_high": {
+        "symptoms": ["face_droop", "slurred_speech", "arm_weakness"],
+        "free_text": "Sudden onset, face drooping on right side, can't lift right arm",
+        "duration_minutes": 15,
+        "voice_stress_score": 0.65,
+    },
+    "breathing_moderate": {
+        "symptoms": ["shortness_of_breath", "wheezing"],
+        "free_text": "Hard to breathe, can talk in short sentences, asthma history",
+        "duration_minutes": 30,
+        "voice_stress_score": 0.70,
+    },
+    "fever_high": {
+        "symptoms": ["high_fever", "chills"],
+        "free_text": "Temperature 103°F since last night, drinking fluids ok",
+        "duration_minutes": 720,
+        "voice_stress_score": 0.40,
+    },
+    "headache_mild": {
+        "symptoms": ["headache", "mild_pain"],
+        "free_text": "Dull headache for a few hours, tolerable",
+        "duration_minutes": 180,
+        "voice_stress_score": 0.20,
+    },
+    "insufficient_info": {
+        "symptoms": [],
+        "free_text": "",
+        "duration_minutes": None,
+        "voice_stress_score": 0.50,
+    },
+    "vomiting_severe": {
+        "symptoms": ["vomiting_severe", "dehydration"],
+        "free_text": "Can't keep anything down for 6 hours, dizzy when standing",
+        "duration_minutes": 360,
+        "voice_stress_score": 0.85,
+    },
+    "anaphylaxis": {
+        "symptoms": ["anaphylaxis_signs", "trouble_breathing", "swelling_face_lips"],
+        "free_text": "Ate peanuts, face swelling rapidly, throat feels tight",
+        "duration_minutes": 10,
+        "voice_stress_score": 0.95,
+    },
+    "bleeding_moderate": {
+        "symptoms": ["moderate_bleeding"],
+        "free_text": "Cut hand on broken glass, bleeding slowing with pressure",
+        "duration_minutes": 15,
+        "voice_stress_score": 0.50,
+    },
+    "unconscious": {
+        "symptoms": ["unconscious"],
+        "free_text": "Found person unresponsive, breathing but not waking up",
+        "duration_minutes": 2,
+        "voice_stress_score": 0.95,
+    },
+    "panic_attack": {
+        "symptoms": ["panic", "palpitations"],
+        "free_text": "Feeling very anxious, heart racing, hard to calm down",
+        "duration_minutes": 20,
+        "voice_stress_score": 0.75,
+    },
+    "fever_mild": {
+        "symptoms": ["fever"],
+        "free_text": "Low-grade fever, feeling tired but ok",
+        "duration_minutes": 240,
+        "voice_stress_score": 0.25,
+    },
+    "head_injury": {
+        "symptoms": ["head_injury", "confusion"],
+        "free_text": "Fell and hit head, feels confused, no loss of consciousness",
+        "duration_minutes": 45,
+        "voice_stress_score": 0.60,
+    },
+    "rash_only": {
+        "symptoms": ["rash"],
+        "free_text": "Itchy rash on arms, no other symptoms",
+        "duration_minutes": 120,
+        "voice_stress_score": 0.15,
+    },
+    "chest_pain_with_sob": {
+        "symptoms": ["chest_pain_crushing", "shortness_of_breath"],
+        "free_text": "Crushing pressure in chest, radiating to left arm, sweating heavily",
+        "duration_minutes": 15,
+        "voice_stress_score": 0.90,
+    },
+}
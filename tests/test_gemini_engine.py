@@ -0,0 +1,18 @@
+"""
+SAHM Symptom Mapping Tests
+map_symptom_to_key must keep first-match-in-SYMPTOM_MAPPING-order semantics.
+"""
+
+from src.gemini_engine import map_symptom_to_key, map_symptoms_to_keys
+
+
+def test_partial_match_follows_mapping_order():
+    # "pain" precedes "panic" and "distress" in SYMPTOM_MAPPING
+    assert map_symptom_to_key("panic pains") == "mild_pain"
+    assert map_symptom_to_key("distress painful") == "mild_pain"
+
+
+def test_direct_match_miss_and_dedup():
+    assert map_symptom_to_key("  Headache ") == "headache"
+    assert map_symptom_to_key("no such symptom") is None
+    assert map_symptoms_to_keys(["headache", "HEADACHE", "panic"]) == ["headache", "panic"]
@@ -0,0 +1,158 @@
+"""
+SAHM Medic Matching Tests
+find_best_match ranks with vectorized scores and, on large rosters, a
+spatial prefilter; these check it against a full scan of the roster.
+"""
+
+import dataclasses
+
+import numpy as np
+import pytest
+
+from src import medic_matcher
+from src.medic_matcher import MedicDatabase, MedicMatcher, MedicStatus, _top_k
+
+DECISION_STUB = {"response_mode": "combined"}
+CATEGORIES = ["cardiac", "trauma_bleeding", "respiratory", "neuro", "mental_health", "other_unclear"]
+
+
+def large_matcher(n: int) -> MedicMatcher:
+    """Matcher whose roster is n copies of the demo medics spread over Riyadh."""
+    demo = MedicDatabase()
+    rng = np.random.default_rng(7)
+    offsets = rng.uniform(-0.18, 0.18, (n, 2))
+    medics = [
+        dataclasses.replace(
+            demo.medics[i % len(demo.medics)],
+            id=f"MED-{5000 + i}",
+            gps_location=(demo.RIYADH_CENTER[0] + dlat, demo.RIYADH_CENTER[1] + dlon),
+        )
+        for i, (dlat, dlon) in enumerate(offsets.tolist())
+    ]
+    return MedicMatcher(MedicDatabase.from_medics(medics))
+
+
+def _top_ids(result):
+    return [result["assigned_medic"]["id"]] + [alt["id"] for alt in result["alternatives"]]
+
+
+def _assert_prefilter_matches_full_scan(monkeypatch, matcher):
+    prefiltered = [
+        _top_ids(matcher.find_best_match(DECISION_STUB, {"severity_level": 3, "category": category}, scenario_seed=seed))
+        for category in CATEGORIES
+        for seed in range(100)
+    ]
+    monkeypatch.setattr(medic_matcher, "KDTREE_MIN_ROSTER", len(matcher.db.medics))
+    full_scan = [
+        _top_ids(matcher.find_best_match(DECISION_STUB, {"severity_level": 3, "category": category}, scenario_seed=seed))
+        for category in CATEGORIES
+        for seed in range(100)
+    ]
+    assert prefiltered == full_scan
+
+
+def test_h3_prefilter_matches_full_scan(monkeypatch):
+    pytest.importorskip("h3")
+    # Sparse rings then fall back to a full scan rather than the kd-tree
+    monkeypatch.setattr(medic_matcher, "SCIPY_AVAILABLE", False)
+    _assert_prefilter_matches_full_scan(monkeypatch, large_matcher(3000))
+
+
+def test_kdtree_prefilter_matches_full_scan(monkeypatch):
+    pytest.importorskip("scipy")
+    monkeypatch.setattr(medic_matcher, "H3_AVAILABLE", False)
+    _assert_prefilter_matches_full_scan(monkeypatch, large_matcher(3000))
+
+
+def _patient_locations(n, seed=3):
+    rng = np.random.default_rng(seed)
+    center = MedicDatabase.RIYADH_CENTER
+    return [(center[0] + dlat, center[1] + dlon) for dlat, dlon in rng.uniform(-0.15, 0.15, (n, 2)).tolist()]
+
+
+def _reference_ranking(matcher, category, location):
+    """Every available medic scored with _calculate_match_score, sorted like the original loop."""
+    scores = [
+        matcher._calculate_match_score(medic, category, location, 3, "aerial")
+        for medic in matcher.db.get_available_medics()
+    ]
+    scores.sort(key=lambda s: s["composite_score"], reverse=True)
+    return scores
+
+
+@pytest.mark.parametrize("roster_size", [None, 90], ids=["demo", "90"])
+def test_find_best_match_matches_reference_ranking(roster_size):
+    matcher = MedicMatcher() if roster_size is None else large_matcher(roster_size)
+    for category in CATEGORIES + ["allergic", "unknown_category"]:
+        for location in _patient_locations(50):
+            result = matcher.find_best_match(DECISION_STUB, {"severity_level": 3, "category": category}, location)
+            reference = _reference_ranking(matcher, category, location)
+            assert _top_ids(result) == [s["medic_id"] for s in reference[:4]], (category, location)
+            assert result["match_score"] == reference[0]["composite_score"]
+            assert result["match_breakdown"] == reference[0]["breakdown"]
+            assert [alt["score"] for alt in result["alternatives"]] == [s["composite_score"] for s in reference[1:4]]
+
+
+def test_top_k_keeps_stable_tie_order():
+    rng = np.random.default_rng(0)
+    for _ in range(200):
+        scores = rng.integers(0, 5, rng.integers(1, 30)).astype(float)
+        k = int(rng.integers(1, 8))
+        assert _top_k(scores, k).tolist() == np.argsort(-scores, kind="stable")[:k].tolist()
+
+
+def test_specialty_compat_matches_specialty_map():
+    matcher = MedicMatcher()
+    categories = {cat for cats in MedicDatabase.SPECIALTY_MAP.values() for cat in cats} | {"unknown_category"}
+    for specialty, cats in MedicDatabase.SPECIALTY_MAP.items():
+        for category in categories:
+            expected = 1.0 if category in cats else 0.7 if specialty == "general" else 0.4
+            assert matcher._calculate_specialty_match(specialty, category) == expected, (specialty, category)
+
+
+def test_distances_km_cached_and_read_only():
+    db = MedicDatabase()
+    location = _patient_locations(1)[0]
+    distance = db.distances_km(location)
+    assert db.distances_km(location) is distance
+    assert not distance.flags.writeable
+    np.testing.assert_array_equal(distance, db.haversine_km(location))
+
+
+def test_update_status_invalidates_matches():
+    matcher = MedicMatcher()
+    triage_output = {"severity_level": 3, "category": "cardiac"}
+    location = _patient_locations(1)[0]
+    first = matcher.find_best_match(DECISION_STUB, triage_output, location)
+    
+    matcher.db.update_status(first["assigned_medic"]["id"], "on_mission")
+    second = matcher.find_best_match(DECISION_STUB, triage_output, location)
+    
+    assert second["assigned_medic"]["id"] == first["alternatives"][0]["id"]
+    assert first["assigned_medic"]["id"] not in _top_ids(second)
+    assert len(matcher.db.get_available_medics()) == int(matcher.db.avail_mask.sum())
+
+
+def test_no_available_medics():
+    matcher = MedicMatcher()
+    for medic in matcher.db.medics:
+        matcher.db.update_status(medic.id, MedicStatus.OFF_DUTY)
+    
+    result = matcher.find_best_match(DECISION_STUB, {"severity_level": 3, "category": "cardiac"}, scenario_seed=1)
+    
+    assert result["status"] == "error"
+    assert result["assigned_medic"] is None
+
+
+def test_fewer_than_four_candidates():
+    demo = MedicDatabase()
+    available = [m for m in demo.medics if m.status == MedicStatus.AVAILABLE]
+    busy = next(m for m in demo.medics if m.status != MedicStatus.AVAILABLE)
+    matcher = MedicMatcher(MedicDatabase.from_medics(available[:2] + [busy]))
+    location = _patient_locations(1)[0]
+    
+    result = matcher.find_best_match(DECISION_STUB, {"severity_level": 3, "category": "cardiac"}, location)
+    reference = _reference_ranking(matcher, "cardiac", location)
+    
+    assert result["status"] == "success"
+    assert _top_ids(result) == [s["medic_id"] for s in reference]
@@ -0,0 +1,28 @@
+"""
+SAHM Medic Matching Benchmarks
+Times find_best_match on the demo roster and on a large synthetic roster
+so matcher speedups (and regressions) are measurable. Timings are
+recorded, not asserted, so shared CI runners can't make this flaky.
+
+Requires pytest-benchmark; skipped otherwise.
+"""
+
+import pytest
+
+pytest.importorskip("pytest_benchmark")
+
+from src.medic_matcher import MedicMatcher
+from tests.test_medic_matcher import large_matcher
+
+DECISION_STUB = {"response_mode": "combined"}
+TRIAGE_STUB = {"severity_level": 3, "category": "cardiac"}
+
+
+@pytest.mark.parametrize("roster_size", [None, 1500], ids=["demo", "1500"])
+def test_find_best_match_benchmark(benchmark, roster_size):
+    matcher = MedicMatcher() if roster_size is None else large_matcher(roster_size)
+    
+    result = benchmark(matcher.find_best_match, DECISION_STUB, TRIAGE_STUB, scenario_seed=1)
+    
+    assert result["status"] == "success"
+    assert result["assigned_medic"] is not None
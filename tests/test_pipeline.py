@@ -3,132 +3,179 @@ SAHM Full Pipeline Test
 Tests integration of Steps 2, 3, and 4.
 """
 
+import importlib
+import io
+import json
 import sys
-import os
-sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from functools import wraps
 
-from src.triage_engine import triage
-from archive.old_decision_engine import make_decision
-from src.medic_matcher import assign_medic
+import pytest
+
+from tests.cases import triage  # memoized triage()
+from tests._scenarios import CANONICAL
+
+
+def _json_memo(func):
+    """
+    Memoize func on a JSON encoding of its arguments (results are shared),
+    so only wrap pure calls: assign_medic depends on roster state and times itself.
+    """
+    cache = {}
+    
+    @wraps(func)
+    def wrapper(*args):
+        key = json.dumps(args, sort_keys=True, default=str)
+        if key not in cache:
+            cache[key] = func(*args)
+        return cache[key]
+    
+    return wrapper
+
+
+_LAZY = {}
+
+
+def _lazy(module: str, name: str, memo: bool = False):
+    """
+    Import module.name on first use, wrapped with _json_memo if memo, so
+    Step 3/4 dependencies only load when a test reaches them.
+    """
+    func = _LAZY.get(name)
+    if func is None:
+        func = getattr(importlib.import_module(module), name)
+        if memo:
+            func = _json_memo(func)
+        _LAZY[name] = func
+    return func
+
+
+def _make_decision():
+    """
+    Step 3 make_decision from archive/, which is not shipped in this tree;
+    the calling test is skipped when it isn't available.
+    """
+    pytest.importorskip("archive.old_decision_engine")
+    return _lazy("archive.old_decision_engine", "make_decision", memo=True)
 
 
 def test_full_pipeline():
     """
     Run a complete end-to-end test of the SAHM pipeline.
     """
-    print("=" * 70)
-    print("SAHM FULL PIPELINE TEST")
-    print("Testing Steps 2 → 3 → 4")
-    print("=" * 70)
-    print()
+    # Build the whole report, then write it to stdout once
+    buf = io.StringIO()
+    
+    print("=" * 70, file=buf)
+    print("SAHM FULL PIPELINE TEST", file=buf)
+    print("Testing Steps 2 → 3 → 4", file=buf)
+    print("=" * 70, file=buf)
+    print(file=buf)
     
     # Test Case: Severe chest pain emergency
-    print("📋 TEST CASE: Severe Chest Pain Emergency")
-    print("-" * 70)
+    print("📋 TEST CASE: Severe Chest Pain Emergency", file=buf)
+    print("-" * 70, file=buf)
     
     # STEP 2: AI Triage
-    print("\n🤖 STEP 2: AI TRIAGE")
-    print("-" * 70)
-    
-    triage_result = triage(
-        symptoms=["chest_pain_crushing", "shortness_of_breath"],
-        free_text="Crushing pressure in chest, radiating to left arm, sweating heavily",
-        duration_minutes=15,
-        voice_stress_score=0.90,
-    )
-    
-    print(f"Category: {triage_result['category']}")
-    print(f"Severity Level: {triage_result['severity_level']}")
-    print(f"Escalate Human: {triage_result['escalate_human']}")
-    print(f"Score: {triage_result['score_breakdown']['total_score']} points")
-    print(f"  - Symptom Score: {triage_result['score_breakdown']['symptom_score']}")
-    print(f"  - Voice Bonus: +{triage_result['score_breakdown']['voice_bonus']}")
-    print(f"  - Red Flag: {'YES ⚠️' if triage_result['score_breakdown']['red_flag_detected'] else 'No'}")
-    print(f"Confidence: {triage_result['confidence']:.0%}")
+    print("\n🤖 STEP 2: AI TRIAGE", file=buf)
+    print("-" * 70, file=buf)
+    
+    triage_result = triage(**CANONICAL["chest_pain_with_sob"])
+    
+    print(f"Category: {triage_result['category']}", file=buf)
+    print(f"Severity Level: {triage_result['severity_level']}", file=buf)
+    print(f"Escalate Human: {triage_result['escalate_human']}", file=buf)
+    print(f"Score: {triage_result['score_breakdown']['total_score']} points", file=buf)
+    print(f"  - Symptom Score: {triage_result['score_breakdown']['symptom_score']}", file=buf)
+    print(f"  - Voice Bonus: +{triage_result['score_breakdown']['voice_bonus']}", file=buf)
+    print(f"  - Red Flag: {'YES ⚠️' if triage_result['score_breakdown']['red_flag_detected'] else 'No'}", file=buf)
+    print(f"Confidence: {triage_result['confidence']:.0%}", file=buf)
     
     # STEP 3: Decision Engine
-    print("\n⚡ STEP 3: DECISION ENGINE")
-    print("-" * 70)
+    print("\n⚡ STEP 3: DECISION ENGINE", file=buf)
+    print("-" * 70, file=buf)
     
+    make_decision = _make_decision()
     decision = make_decision(triage_result)
     
-    print(f"Response Mode: {decision['response_mode'].upper()}")
-    print(f"Aerial ETA: {decision['aerial_eta_minutes']} min")
-    print(f"Ground ETA: {decision['ground_eta_minutes']} min")
-    print(f"Time Savings: {decision['time_savings_minutes']} min")
-    print(f"\nReasoning:")
+    print(f"Response Mode: {decision['response_mode'].upper()}", file=buf)
+    print(f"Aerial ETA: {decision['aerial_eta_minutes']} min", file=buf)
+    print(f"Ground ETA: {decision['ground_eta_minutes']} min", file=buf)
+    print(f"Time Savings: {decision['time_savings_minutes']} min", file=buf)
+    print(f"\nReasoning:", file=buf)
     for reason in decision['reasoning']:
-        print(f"  - {reason}")
+        print(f"  - {reason}", file=buf)
     
-    print(f"\nReal-Time Factors:")
+    print(f"\nReal-Time Factors:", file=buf)
     factors = decision['real_time_factors']
-    print(f"  Traffic: {factors['traffic']['traffic_level']} (ground ETA: {factors['traffic']['estimated_ground_eta_minutes']} min)")
-    print(f"  Crowd: {factors['crowd']['density_level']}")
+    print(f"  Traffic: {factors['traffic']['traffic_level']} (ground ETA: {factors['traffic']['estimated_ground_eta_minutes']} min)", file=buf)
+    print(f"  Crowd: {factors['crowd']['density_level']}", file=buf)
     if factors['crowd']['active_event']:
-        print(f"    - Event: {factors['crowd']['active_event']}")
-    print(f"  Weather: {factors['weather']['condition']} (wind: {factors['weather']['wind_speed_kph']} kph)")
-    print(f"  Aerial Safe: {'✅ Yes' if factors['weather']['aerial_safe'] else '❌ No'}")
-    print(f"  Geography: {factors['geography']['location_type']}")
+        print(f"    - Event: {factors['crowd']['active_event']}", file=buf)
+    print(f"  Weather: {factors['weather']['condition']} (wind: {factors['weather']['wind_speed_kph']} kph)", file=buf)
+    print(f"  Aerial Safe: {'✅ Yes' if factors['weather']['aerial_safe'] else '❌ No'}", file=buf)
+    print(f"  Geography: {factors['geography']['location_type']}", file=buf)
     
     # STEP 4: Medic Matching
     if decision['response_mode'] in ['aerial_only', 'combined']:
-        print("\n👨‍⚕️ STEP 4: MEDIC MATCHING")
-        print("-" * 70)
+        print("\n👨‍⚕️ STEP 4: MEDIC MATCHING", file=buf)
+        print("-" * 70, file=buf)
         
+        assign_medic = _lazy("src.medic_matcher", "assign_medic")
         assignment = assign_medic(decision, triage_result)
         
         if assignment['status'] == 'success':
             medic = assignment['assigned_medic']
             
-            print(f"Match Time: {assignment['match_time_seconds']}s {'✅ (Within target)' if assignment['match_time_seconds'] < 3.0 else '⚠️ (Exceeded target)'}")
-            print(f"\nAssigned Medic:")
-            print(f"  ID: {medic['id']}")
-            print(f"  Name: {medic['name']}")
-            print(f"  Specialty: {medic['specialty']}")
-            print(f"  Certification: {medic['certification']}")
-            print(f"  Distance: {medic['distance_km']} km")
-            print(f"  ETA: {medic['eta_minutes']} minutes")
-            print(f"  Rating: {medic['rating']}/5.0 ⭐")
-            print(f"  Missions: {medic['missions_completed']}")
-            print(f"  Languages: {', '.join(medic['languages'])}")
+            print(f"Match Time: {assignment['match_time_seconds']}s {'✅ (Within target)' if assignment['match_time_seconds'] < 3.0 else '⚠️ (Exceeded target)'}", file=buf)
+            print(f"\nAssigned Medic:", file=buf)
+            print(f"  ID: {medic['id']}", file=buf)
+            print(f"  Name: {medic['name']}", file=buf)
+            print(f"  Specialty: {medic['specialty']}", file=buf)
+            print(f"  Certification: {medic['certification']}", file=buf)
+            print(f"  Distance: {medic['distance_km']} km", file=buf)
+            print(f"  ETA: {medic['eta_minutes']} minutes", file=buf)
+            print(f"  Rating: {medic['rating']}/5.0 ⭐", file=buf)
+            print(f"  Missions: {medic['missions_completed']}", file=buf)
+            print(f"  Languages: {', '.join(medic['languages'])}", file=buf)
             
-            print(f"\nMatch Score: {assignment['match_score']:.3f}")
+            print(f"\nMatch Score: {assignment['match_score']:.3f}", file=buf)
             breakdown = assignment['match_breakdown']
-            print(f"  - Distance: {breakdown['distance_score']}")
-            print(f"  - Specialty: {breakdown['specialty_score']}")
-            print(f"  - Workload: {breakdown['workload_score']}")
-            print(f"  - Rating: {breakdown['rating_score']}")
-            print(f"  - Certification: {breakdown['cert_score']}")
+            print(f"  - Distance: {breakdown['distance_score']}", file=buf)
+            print(f"  - Specialty: {breakdown['specialty_score']}", file=buf)
+            print(f"  - Workload: {breakdown['workload_score']}", file=buf)
+            print(f"  - Rating: {breakdown['rating_score']}", file=buf)
+            print(f"  - Certification: {breakdown['cert_score']}", file=buf)
             
             if assignment.get('alternatives'):
-                print(f"\nAlternative Medics:")
+                print(f"\nAlternative Medics:", file=buf)
                 for alt in assignment['alternatives'][:3]:
-                    print(f"  - {alt['name']} (Score: {alt['score']:.3f}, ETA: {alt['eta_minutes']} min)")
+                    print(f"  - {alt['name']} (Score: {alt['score']:.3f}, ETA: {alt['eta_minutes']} min)", file=buf)
         else:
-            print(f"❌ Assignment failed: {assignment['reasoning']}")
+            print(f"❌ Assignment failed: {assignment['reasoning']}", file=buf)
     else:
-        print("\n👨‍⚕️ STEP 4: MEDIC MATCHING")
-        print("-" * 70)
-        print("⏭️  Skipped (ground ambulance only)")
+        print("\n👨‍⚕️ STEP 4: MEDIC MATCHING", file=buf)
+        print("-" * 70, file=buf)
+        print("⏭️  Skipped (ground ambulance only)", file=buf)
     
     # DEPLOYMENT SUMMARY
-    print("\n📋 DEPLOYMENT SUMMARY")
-    print("=" * 70)
+    print("\n📋 DEPLOYMENT SUMMARY", file=buf)
+    print("=" * 70, file=buf)
     
     plan = decision['deployment_plan']
-    print(f"Primary Unit: {plan['primary_unit'].replace('_', ' ').title()}")
-    print(f"\nInstructions:")
+    print(f"Primary Unit: {plan['primary_unit'].replace('_', ' ').title()}", file=buf)
+    print(f"\nInstructions:", file=buf)
     for instruction in plan['instructions']:
-        print(f"  {instruction}")
+        print(f"  {instruction}", file=buf)
     
     if decision['response_mode'] in ['aerial_only', 'combined'] and assignment.get('status') == 'success':
-        print(f"\nAssigned to: {medic['name']} ({medic['id']})")
-        print(f"Expected arrival: {medic['eta_minutes']} minutes")
+        print(f"\nAssigned to: {medic['name']} ({medic['id']})", file=buf)
+        print(f"Expected arrival: {medic['eta_minutes']} minutes", file=buf)
     
-    print("\n" + "=" * 70)
-    print("✅ PIPELINE TEST COMPLETE")
-    print("=" * 70)
-    print()
+    print("\n" + "=" * 70, file=buf)
+    print("✅ PIPELINE TEST COMPLETE", file=buf)
+    print("=" * 70, file=buf)
+    print(file=buf)
+    sys.stdout.write(buf.getvalue())
     
     # Return results for programmatic use
     return {
@@ -140,56 +187,40 @@ def test_full_pipeline():
 
 def test_multiple_scenarios():
     """Test pipeline with different severity levels"""
+    buf = io.StringIO()
     
-    print("\n" + "=" * 70)
-    print("TESTING MULTIPLE SCENARIOS")
-    print("=" * 70)
+    print("\n" + "=" * 70, file=buf)
+    print("TESTING MULTIPLE SCENARIOS", file=buf)
+    print("=" * 70, file=buf)
     
     scenarios = [
-        {
-            "name": "Low Severity (Mild Headache)",
-            "symptoms": ["headache", "mild_pain"],
-            "free_text": "Dull headache for a few hours",
-            "duration_minutes": 180,
-            "voice_stress_score": 0.20,
-        },
-        {
-            "name": "Medium Severity (High Fever)",
-            "symptoms": ["high_fever", "chills"],
-            "free_text": "Fever since last night",
-            "duration_minutes": 720,
-            "voice_stress_score": 0.45,
-        },
-        {
-            "name": "High Severity (Stroke)",
-            "symptoms": ["face_droop", "slurred_speech", "arm_weakness"],
-            "free_text": "Sudden onset, can't lift right arm",
-            "duration_minutes": 10,
-            "voice_stress_score": 0.85,
-        },
+        ("Low Severity (Mild Headache)", CANONICAL["headache_mild"]),
+        ("Medium Severity (High Fever)", CANONICAL["fever_high"]),
+        ("High Severity (Stroke)", CANONICAL["stroke_high"]),
     ]
     
-    for scenario in scenarios:
-        print(f"\n📋 {scenario['name']}")
-        print("-" * 70)
+    for name, inputs in scenarios:
+        print(f"\n📋 {name}", file=buf)
+        print("-" * 70, file=buf)
         
         # Run triage
-        triage_result = triage(**{k: v for k, v in scenario.items() if k != 'name'})
-        decision = make_decision(triage_result)
+        triage_result = triage(**inputs)
+        decision = _make_decision()(triage_result)
         
-        print(f"Severity: Level {triage_result['severity_level']}")
-        print(f"Response Mode: {decision['response_mode'].upper()}")
-        print(f"Time Savings: {decision['time_savings_minutes']} min")
+        print(f"Severity: Level {triage_result['severity_level']}", file=buf)
+        print(f"Response Mode: {decision['response_mode'].upper()}", file=buf)
+        print(f"Time Savings: {decision['time_savings_minutes']} min", file=buf)
         
         if decision['response_mode'] in ['aerial_only', 'combined']:
-            assignment = assign_medic(decision, triage_result)
+            assignment = _lazy("src.medic_matcher", "assign_medic")(decision, triage_result)
             if assignment['status'] == 'success':
-                print(f"Medic: {assignment['assigned_medic']['name']} (ETA: {assignment['assigned_medic']['eta_minutes']} min)")
-        print()
+                print(f"Medic: {assignment['assigned_medic']['name']} (ETA: {assignment['assigned_medic']['eta_minutes']} min)", file=buf)
+        print(file=buf)
     
-    print("=" * 70)
-    print("✅ ALL SCENARIOS TESTED")
-    print("=" * 70)
+    print("=" * 70, file=buf)
+    print("✅ ALL SCENARIOS TESTED", file=buf)
+    print("=" * 70, file=buf)
+    sys.stdout.write(buf.getvalue())
 
 
 if __name__ == "__main__":
@@ -0,0 +1,69 @@
+"""
+SAHM Triage Engine Tests
+triage_mask and triage_batch are the pre-encoded entry points; these check
+they agree with triage() and guard the compiled kernel's inputs.
+"""
+
+import copy
+import random
+
+import numpy as np
+import pytest
+
+from src.triage_engine import (
+    BATCH_CATEGORIES,
+    SYMPTOM_ID,
+    _EMPTY_RESPONSE,
+    symptom_mask,
+    triage,
+    triage_batch,
+    triage_mask,
+)
+
+
+def _random_cases(n=500, seed=7):
+    """(symptoms, voice_stress_score) pairs, including unknowns and empties."""
+    rng = random.Random(seed)
+    pool = sorted(SYMPTOM_ID) + ["not_a_symptom"]
+    return [
+        (rng.sample(pool, rng.randint(0, 6)), rng.choice([None, 0.2, 0.79, 0.8, 0.95]))
+        for _ in range(n)
+    ]
+
+
+def test_triage_mask_matches_triage():
+    for symptoms, voice in _random_cases():
+        expected = triage(symptoms, "some text", 15, voice)
+        assert triage_mask(symptom_mask(symptoms), "some text", 15, voice) == expected, symptoms
+
+
+def test_triage_batch_matches_triage():
+    cases = _random_cases()
+    masks = np.array([symptom_mask(symptoms) for symptoms, _ in cases], dtype=np.int64)
+    voice = np.array([np.nan if v is None else v for _, v in cases])
+    out = triage_batch(masks, voice)
+
+    for (symptoms, v), category, severity, escalate in zip(cases, out.category, out.severity, out.escalate):
+        # Free text keeps empty symptom lists out of the Level 0 shortcut, as in the batch
+        expected = triage(symptoms, "some text", None, v)
+        assert BATCH_CATEGORIES[category] == expected["category"], symptoms
+        assert severity == expected["severity_level"], symptoms
+        assert escalate == expected["escalate_human"], symptoms
+
+
+@pytest.mark.parametrize("mask", [-1, 1 << len(SYMPTOM_ID), 1 << 50])
+def test_out_of_range_masks_rejected(mask):
+    with pytest.raises(ValueError):
+        triage_mask(mask, "")
+    with pytest.raises(ValueError):
+        triage_batch(np.array([0, mask], dtype=np.int64), np.zeros(2))
+
+
+def test_empty_response_is_not_shared():
+    before = copy.deepcopy(_EMPTY_RESPONSE)
+    response = triage([], "", 5)
+    response["category"] = "cardiac"
+    response["score_breakdown"]["symptom_score"] = 9
+
+    assert _EMPTY_RESPONSE == before
+    assert triage([], "")["score_breakdown"]["symptom_score"] == 0
@@ -0,0 +1,50 @@
+"""
+SAHM Validator Consistency Tests
+The validator decides whole datasets with a vectorized rule pass; these
+check that it agrees with dispatch() row for row, so an engine regression
+can't slip through validation.
+"""
+
+import itertools
+
+import numpy as np
+
+from src.data_loader import dispatch_table, load_cases, load_scenarios
+from src.dispatch_engine import (
+    EFFICIENCY_TIME_DELTA,
+    RULE_ORDER,
+    WEATHER_RISK_THRESHOLD,
+    dispatch,
+    rule_indices,
+)
+from src.validator import _evaluate_rules
+
+
+def _grid():
+    """Inputs on and around every threshold."""
+    weather = [0.0, WEATHER_RISK_THRESHOLD - 0.1, WEATHER_RISK_THRESHOLD, WEATHER_RISK_THRESHOLD + 0.1, 88.0]
+    harm = [4, 10.0, 29.8, 60]
+    ground = [3.6, 10.0, 13.6, 29.8, 45.0]
+    air = [0.5, 3.6, 29.8 - EFFICIENCY_TIME_DELTA, 20.0]
+    return list(itertools.product(weather, harm, ground, air))
+
+
+def test_rule_indices_match_dispatch():
+    rows = _grid()
+    indices = rule_indices(*np.array(rows, dtype=float).T)
+    for row, idx in zip(rows, indices.tolist()):
+        assert RULE_ORDER[idx] == dispatch(*row).rule_triggered, row
+
+
+def test_validator_decisions_match_dispatch():
+    for records in (load_scenarios(), load_cases()):
+        rule_idx, decisions = _evaluate_rules(dispatch_table(records))
+        for record, idx, decision in zip(records, rule_idx.tolist(), decisions.tolist()):
+            result = dispatch(
+                record["weather_risk_pct"],
+                record["harm_threshold_min"],
+                record["ground_eta_min"],
+                record["air_eta_min"],
+            )
+            assert RULE_ORDER[idx] == result.rule_triggered
+            assert decision == result.response_mode